@@ -9,6 +9,9 @@ from great_tables import GT, html, loc, md, style
 from lets_plot import *  # type: ignore
 
 sys.path.append(os.path.abspath("src"))
+
+from mapping_index import get_mapping_index  # type: ignore
+
 logging.basicConfig(level=logging.INFO)
 
 parser = argparse.ArgumentParser()
@@ -34,7 +37,6 @@ def main():
     post_df = pd.read_csv(f"./data/post_arb_values_{season}.csv").rename(
         columns={"Avg Salary": "ottoneu_av"}
     )
-    mappings = pd.read_csv("data/mappings_update_2023-09-14.csv")
     year_end_values = pd.read_csv(f"data/final_{season}_values.csv")
     leagues_info = pd.read_csv("data/league_settings.csv")
 
@@ -44,13 +46,11 @@ def main():
     new_cols = [col.lower().replace(" ", "_") for col in all_values.columns]
     all_values.columns = new_cols
     logging.info(all_values.columns)
-    all_values = all_values[
-        ["id", "name", "position", "ottoneu_av_pre", "ottoneu_av_post"]
-    ].merge(
-        mappings[["ottoneu_player_id", "nba_player_id"]],
-        how="left",
-        left_on="id",
-        right_on="ottoneu_player_id",
+    all_values = get_mapping_index().add_columns(
+        all_values[["id", "name", "position", "ottoneu_av_pre", "ottoneu_av_post"]],
+        on="id",
+        cols=["ottoneu_player_id", "nba_player_id"],
+        id_col="ottoneu_player_id",
     )
     all_values["nba_player_id"] = all_values.nba_player_id.fillna(0).astype(int)
     all_values["ottoneu_av_post"] = all_values.ottoneu_av_post.str.replace(
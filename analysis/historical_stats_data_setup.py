@@ -22,6 +22,7 @@ import requests
 # https://stackoverflow.com/questions/68695851/mypy-cannot-find-implementation-or-library-stub-for-module
 from calc_stats import calc_categories_value  # type: ignore
 from calc_stats import calc_fantasy_pts, calc_player_values
+from mapping_index import get_mapping_index
 from transform import (find_surplus_positions,  # type: ignore
                        get_draftable_players)
 
@@ -195,16 +196,19 @@ def get_otto_values_df(
                 f"./data/{season}_preseason_projections/ottobasket_projections_{season}.csv"
             )
         )
-        mappings = pd.read_csv("./data/mappings_update_2023-09-14.csv")
-        season_df = season_df.merge(
-            mappings[["ottoneu_player_id", "nba_player_id"]],
-            left_on="player_id",
-            right_on="nba_player_id",
-            how="left",
-        ).merge(
-            ottoneu_season_positions[["ottoneu_player_id", "ottoneu_position"]],
-            on="ottoneu_player_id",
-            how="left",
+        season_df = (
+            get_mapping_index()
+            .add_columns(
+                season_df,
+                on="player_id",
+                cols=["ottoneu_player_id", "nba_player_id"],
+                id_col="nba_player_id",
+            )
+            .merge(
+                ottoneu_season_positions[["ottoneu_player_id", "ottoneu_position"]],
+                on="ottoneu_player_id",
+                how="left",
+            )
         )
         season_df.ottoneu_position.fillna(season_df.position, inplace=True)
         # annoying have to do this here. again, probably a better way
@@ -11,12 +11,12 @@ import sys
 from datetime import date
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 from great_tables import GT, html, loc, md, style
 
+from http_client import get_client
 from leagues import get_league_info, get_league_rosters, get_league_scoring
-from utils import _sleep_unif
+from tables import extract_table
+from utils import get_values_df
 
 sys.path.append(os.path.abspath("src"))
 
@@ -27,17 +27,10 @@ def scrape_league_transactions(
     league_id: int, page_id: int, pull_headers=True
 ) -> pd.DataFrame:
     url = f"https://ottoneu.fangraphs.com/basketball/{league_id}/transactions?page={page_id}"
-    resp = requests.get(url)
-    soup = BeautifulSoup(resp.content, "html.parser")
-    txn_table = soup.find("main").find("table")
-    txn_headers = [
-        th.text.strip() for th in txn_table.find("thead").find("tr").find_all("th")
-    ]
-    txn_rows = [
-        [td.text.strip() for td in tr.find_all("td")]
-        for tr in txn_table.find("tbody").find_all("tr")
-        # if tr.find_all("td")[3].text.strip() == "increase"
-    ]
+    resp = get_client().get(url)
+    txn_table = extract_table(resp.content, container="main")
+    txn_headers = txn_table.columns.tolist()
+    txn_rows = txn_table.values.tolist()
     if pull_headers:
         return (txn_headers, txn_rows)
     return txn_rows
@@ -46,15 +39,24 @@ def scrape_league_transactions(
 def get_league_inflation(
     league_id: int = 26, league_scoring: str = "trad_points"
 ) -> float:
-    _sleep_unif()
     league_salaries = get_league_rosters(league_id)
     TOTAL_BUDGET = 12 * 400
     # 25*12 = 300
     # each transaction page is 50 long
     # 	# get values
-    sheet_id = "1GgwZpflcyoRYMP0yL2hrbNwndJjVFm34x3jXnUooSfA"
-    values_df = pd.read_csv(
-        f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
+    if league_scoring == "categories":
+        scoring_col = f"{league_scoring}_value"
+    elif league_scoring == "simple_points":
+        scoring_col = f"{league_scoring}_value"
+    else:
+        scoring_col = "trad_points_value"
+    values_df = get_values_df(
+        columns=[
+            "player",
+            "ottoneu_player_id",
+            "ottoneu_position",
+            f"{scoring_col}_ros",
+        ]
     )
     league_values_df = league_salaries.merge(
         values_df, on="ottoneu_player_id", how="left"
@@ -66,12 +68,6 @@ def get_league_inflation(
     # fill the rest of columns NA's with 0
     league_values_df.fillna(0, inplace=True)
 
-    if league_scoring == "categories":
-        scoring_col = f"{league_scoring}_value"
-    elif league_scoring == "simple_points":
-        scoring_col = f"{league_scoring}_value"
-    else:
-        scoring_col = "trad_points_value"
     league_values_df["ros_surplus"] = (
         league_values_df[f"{scoring_col}_ros"] - league_values_df.salary
     )
@@ -95,10 +91,9 @@ def main():
     if 1 == 0:
         all_leagues = get_league_info()
         league_ids = all_leagues.league_id.unique().tolist()
-        # need to figure out the league scoring to reduce the # of calls to the GSheet
         league_inflation_values = list()
         for league_id in league_ids:
-            league_scoring = get_league_scoring(league_id, all_leagues)
+            league_scoring = get_league_scoring(league_id)
             inflation_idx = get_league_inflation(league_id, league_scoring)
             league_inflation_values.append(inflation_idx)
 
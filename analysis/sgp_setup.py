@@ -12,13 +12,13 @@ import sys
 
 import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
 sys.path.append(os.path.abspath("src"))
 
 from calc_stats import (calc_per_game_projections,  # type: ignore
                         calc_player_values)
+from http_client import get_client  # type: ignore
+from tables import convert_numeric_columns, extract_tables  # type: ignore
 from transform import find_surplus_positions  # type: ignore
 from transform import (get_draftable_players, get_name_map,
                        get_ottoneu_leaderboard, prep_stats_df)
@@ -37,36 +37,17 @@ season_type = parser.add_argument(
 )
 
 
-def get_table(table) -> pd.DataFrame:
-    headers = [
-        th.text.lower().strip() for th in table.find("thead").find("tr").find_all("th")
-    ]
-    rows = [
-        [td.text.strip() for td in row.find_all("td")]
-        for row in table.find("tbody").find_all("tr")
-    ]
-    return pd.DataFrame(rows, columns=headers)
-
-
 def get_standings_page(league_id: int) -> pd.DataFrame:
     # make season map
     # 4 = 2023-24, 3 = 2022-23, 2 = 2021-22
     url = f"https://ottoneu.fangraphs.com/basketball/{league_id}/standings/4"
-    r = requests.get(url, timeout=None)
-    soup = BeautifulSoup(r.content, "html.parser")
-    tables = soup.find_all("table")
+    r = get_client().get(url)
     print(url)
-    print(len(tables))
-    main_table = get_table(tables[1])
-    shots_table = get_table(tables[2])
+    main_table, shots_table = extract_tables(r.content, [1, 2], lowercase_headers=True)
     overall_table = main_table.merge(
         shots_table, how="inner", on=["team", "g", "mins"], suffixes=("", "_foo")
     )
-    for col in overall_table.columns:
-        if col == "team":
-            continue
-        overall_table[col] = overall_table[col].astype(float)
-    return overall_table
+    return convert_numeric_columns(overall_table, exclude=["team"])
 
 
 def calc_sgp_slopes(df: pd.DataFrame) -> dict:
@@ -16,7 +16,9 @@ from pulp import PULP_CBC_CMD, LpMaximize, LpProblem, LpVariable, lpSum
 
 sys.path.append(os.path.abspath("src"))
 
-from utils import _setup_gdrive, _upload_data, get_name_map
+from http_client import get_client
+from mapping_index import get_mapping_index
+from utils import _setup_gdrive, _upload_data
 
 SALARY_CAP = 180
 
@@ -46,7 +48,7 @@ def cleanup_and_save_images(player_ids: list, mappings: pd.DataFrame):
 
 def get_sixpicks_leaderboard(date: str) -> pd.DataFrame:
     url = f"https://ottoneu.fangraphs.com/sixpicks/basketball/board/{date}"
-    resp = requests.get(url)
+    resp = get_client().get(url)
     soup = BeautifulSoup(resp.content, "html.parser")
     table = soup.find("div", {"class": "left"}).find("table")
     headers = [
@@ -94,11 +96,8 @@ def main():
     save = False
     yesterday = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
     df = get_sixpicks_leaderboard(yesterday)
-    mappings = get_name_map()
-    df = df.merge(
-        mappings[["ottoneu_player_id", "ottoneu_position"]],
-        on="ottoneu_player_id",
-        how="left",
+    df["ottoneu_position"] = get_mapping_index().translate(
+        df.ottoneu_player_id, "ottoneu_player_id", "ottoneu_position"
     )
     df["price"] = df.price.str.replace("$", "").astype(float)
     df["pts"] = df.pts.astype(float)
@@ -0,0 +1,61 @@
+"""
+Times pulling the standings tables out of a saved page with BeautifulSoup
+against tables.extract_tables. Run from the repo root:
+
+    python analysis/table_parsing_benchmark.py
+"""
+
+import os
+import sys
+import timeit
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath("src"))
+
+from tables import convert_numeric_columns, extract_tables  # type: ignore
+
+FIXTURES = ["tests/fixtures/standings.html"]
+
+
+def soup_standings(html: bytes) -> pd.DataFrame:
+    """The standings parsing as it was done with BeautifulSoup."""
+    tables = BeautifulSoup(html, "html.parser").find_all("table")
+    parsed = list()
+    for table in tables[1:3]:
+        headers = [
+            th.text.lower().strip()
+            for th in table.find("thead").find("tr").find_all("th")
+        ]
+        rows = [
+            [td.text.strip() for td in row.find_all("td")]
+            for row in table.find("tbody").find_all("tr")
+        ]
+        parsed.append(pd.DataFrame(rows, columns=headers))
+    overall_table = parsed[0].merge(parsed[1], on=["team", "g", "mins"])
+    for col in overall_table.columns:
+        if col == "team":
+            continue
+        overall_table[col] = overall_table[col].astype(float)
+    return overall_table
+
+
+def extract_standings(html: bytes) -> pd.DataFrame:
+    main_table, shots_table = extract_tables(html, [1, 2], lowercase_headers=True)
+    overall_table = main_table.merge(shots_table, on=["team", "g", "mins"])
+    return convert_numeric_columns(overall_table, exclude=["team"])
+
+
+def main():
+    for fixture in FIXTURES:
+        with open(fixture, "rb") as f:
+            html = f.read()
+        pd.testing.assert_frame_equal(soup_standings(html), extract_standings(html))
+        for name, parse in [("soup", soup_standings), ("extract", extract_standings)]:
+            num_runs, seconds = timeit.Timer(lambda: parse(html)).autorange()
+            print(f"{fixture} {name}: {1000 * seconds / num_runs:.2f}ms per page")
+
+
+if __name__ == "__main__":
+    main()
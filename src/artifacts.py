@@ -0,0 +1,96 @@
+"""
+A local store for the pipeline outputs. Each artifact is saved as an Arrow IPC
+file at ./data/artifacts/<name>/<version>.arrow, where the version is the run's
+timestamp, so pages can read the latest run from disk, memory-mapped and only
+pulling the columns they need.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow.feather as feather  # type: ignore
+
+ARTIFACT_DIR = "./data/artifacts"
+VERSION_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def _artifact_path(name: str, version: str) -> str:
+    return os.path.join(ARTIFACT_DIR, name, f"{version}.arrow")
+
+
+def save_artifact(
+    df: pd.DataFrame,
+    name: str,
+    run_time: Optional[datetime] = None,
+    num_keep: int = 5,
+) -> str:
+    """
+    Saves the dataframe as a new version of the artifact, keyed by the run time
+    (defaults to now), and prunes all but the `num_keep` latest versions.
+    Returns the version.
+    """
+    version = (run_time or datetime.now()).strftime(VERSION_FORMAT)
+    os.makedirs(os.path.join(ARTIFACT_DIR, name), exist_ok=True)
+    path = _artifact_path(name, version)
+    # write to a unique file then rename, so readers never see a partially
+    # written file and concurrent writers don't share one.
+    # uncompressed so that reads can be memory-mapped
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    for old_version in list_artifact_versions(name)[:-num_keep]:
+        try:
+            os.remove(_artifact_path(name, old_version))
+        except FileNotFoundError:
+            # already pruned by another writer
+            pass
+    return version
+
+
+def list_artifact_versions(name: str) -> List[str]:
+    """Lists the saved versions of the artifact, oldest first."""
+    artifact_dir = os.path.join(ARTIFACT_DIR, name)
+    if not os.path.isdir(artifact_dir):
+        return list()
+    return sorted(
+        file_name.removesuffix(".arrow")
+        for file_name in os.listdir(artifact_dir)
+        if file_name.endswith(".arrow")
+    )
+
+
+def get_latest_version(name: str) -> Optional[str]:
+    """Gets the most recent version of the artifact, if there are any."""
+    versions = list_artifact_versions(name)
+    return versions[-1] if versions else None
+
+
+def version_to_datetime(version: str) -> datetime:
+    return datetime.strptime(version, VERSION_FORMAT)
+
+
+def load_artifact(
+    name: str,
+    version: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> pd.DataFrame:
+    """
+    Loads a version of the artifact, defaulting to the latest. Only the given
+    columns are read if `columns` is passed.
+    """
+    version = version or get_latest_version(name)
+    if version is None:
+        raise FileNotFoundError(f"No saved versions of {name}!")
+    return feather.read_table(
+        _artifact_path(name, version), columns=columns, memory_map=memory_map
+    ).to_pandas()
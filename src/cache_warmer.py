@@ -0,0 +1,193 @@
+"""
+Keeps the caches behind the pages warm so no visitor pays for a cold rebuild.
+A background thread checks every few minutes for anything due to expire soon
+and rebuilds it ahead of time: the stats snapshot along with its rest of
+season valuations and free agent pools, and the rosters and scoring of the
+most requested leagues. Anything that fails to rebuild isn't tried again for
+`RETRY_SECONDS`. The snapshot is only built ahead of time once a page that
+reads it has started the warmer, so pages that only read leagues don't pay for
+a snapshot build.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from free_agent_pool import get_free_agent_pool, scoring_types
+from leagues import get_league_rosters, get_league_scoring
+from stats_snapshot import (RETRY_SECONDS, SNAPSHOT_TTL, peek_stats_snapshot,
+                            refresh_stats_snapshot)
+from swr_cache import SWRCache
+from valuation_cache import get_snapshot_values
+
+logging.basicConfig(level=logging.INFO)
+
+# how long before expiry to rebuild
+DEFAULT_LEAD_TIME = 30 * 60
+DEFAULT_INTERVAL = 5 * 60
+DEFAULT_NUM_LEAGUES = 10
+
+
+def warm_stats_snapshot() -> None:
+    """
+    Rebuilds the stats snapshot, the valuations the pages use from it and the
+    free agent pools.
+    """
+    previous = peek_stats_snapshot()
+    if refresh_stats_snapshot() is previous:
+        raise RuntimeError("The stats snapshot was not rebuilt!")
+    for is_rollup in [True, False]:
+        get_snapshot_values("rest_of_season", is_rollup=is_rollup)
+    for league_scoring in scoring_types:
+        get_free_agent_pool(league_scoring)
+
+
+class CacheWarmer:
+    def __init__(
+        self,
+        league_caches: Dict[str, SWRCache],
+        num_leagues: int = DEFAULT_NUM_LEAGUES,
+        lead_time: float = DEFAULT_LEAD_TIME,
+        interval: float = DEFAULT_INTERVAL,
+        clock: Callable[[], float] = time.time,
+        warm_snapshot: bool = True,
+    ):
+        self.league_caches = league_caches
+        # whether to build the snapshot if no one has yet
+        self.warm_snapshot = warm_snapshot
+        self.num_leagues = num_leagues
+        self.lead_time = lead_time
+        self.interval = interval
+        self.clock = clock
+        self.last_warmed: Dict[Tuple[str, Tuple], float] = dict()
+        # when each target that failed to warm can be tried again
+        self.retry_at: Dict[Tuple[str, Tuple], float] = dict()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self) -> pd.DataFrame:
+        """
+        Lists what is kept warm, with the seconds until each is next warmed
+        (zero or less if it's due) and when it was last warmed. Leagues that
+        aren't cached have no time, since they're only fetched on request, and
+        targets that failed to warm aren't due until their retry time.
+        """
+        now = self.clock()
+        self.retry_at = {
+            target: retry_at
+            for target, retry_at in self.retry_at.items()
+            if retry_at > now
+        }
+        rows = list()
+        snapshot = peek_stats_snapshot()
+        if snapshot is not None or self.warm_snapshot:
+            rows.append(
+                {
+                    "target": "stats_snapshot",
+                    "args": (),
+                    "requests": None,
+                    "warm_in": (
+                        0.0
+                        if snapshot is None
+                        else snapshot.built_at + SNAPSHOT_TTL - self.lead_time - now
+                    ),
+                }
+            )
+        for name, cache in self.league_caches.items():
+            for key in cache.most_requested(self.num_leagues):
+                age = cache.get_age(*key)
+                rows.append(
+                    {
+                        "target": name,
+                        "args": key,
+                        "requests": cache.requests[key],
+                        "warm_in": (
+                            None if age is None else cache.ttl - self.lead_time - age
+                        ),
+                    }
+                )
+        for row in rows:
+            target = (row["target"], row["args"])
+            row["last_warmed"] = self.last_warmed.get(target)
+            if row["warm_in"] is not None and target in self.retry_at:
+                row["warm_in"] = max(row["warm_in"], self.retry_at[target] - now)
+        return pd.DataFrame(rows)
+
+    def _warm(self, target: str, key: Tuple, warm: Callable[[], object]) -> None:
+        start = self.clock()
+        try:
+            warm()
+        except Exception as err:
+            logging.warning(
+                f"Could not warm {target}{key}, retrying in {RETRY_SECONDS}s: {err}"
+            )
+            self.retry_at[(target, key)] = self.clock() + RETRY_SECONDS
+            return
+        self.retry_at.pop((target, key), None)
+        self.last_warmed[(target, key)] = self.clock()
+        logging.info(f"Warmed {target}{key} in {self.clock() - start:.1f}s")
+
+    def run_once(self) -> List[str]:
+        """Warms everything due within the lead time. Returns what was warmed."""
+        warmed = list()
+        for row in self.schedule().itertuples():
+            if pd.isna(row.warm_in) or row.warm_in > 0:
+                continue
+            if row.target == "stats_snapshot":
+                self._warm(row.target, row.args, warm_stats_snapshot)
+            else:
+                cache = self.league_caches[row.target]
+                self._warm(row.target, row.args, lambda: cache.refresh(*row.args))
+            warmed.append(f"{row.target}{row.args}")
+        return warmed
+
+    def _run(self) -> None:
+        # the first round builds the snapshot before anyone has to wait on it
+        while True:
+            try:
+                self.run_once()
+            except Exception as err:
+                # keep the thread alive for the next round
+                logging.warning(f"Cache warming failed: {err}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="cache-warmer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_warmer: Optional[CacheWarmer] = None
+_warmer_lock = threading.Lock()
+
+
+def start_cache_warmer(warm_snapshot: bool = True) -> CacheWarmer:
+    """
+    Starts the warmer shared by every page, if it isn't running yet. Pages that
+    don't read the stats snapshot pass `warm_snapshot=False`, so the snapshot
+    is only built once a page that reads it has started the warmer.
+    """
+    global _warmer
+    with _warmer_lock:
+        if _warmer is None:
+            _warmer = CacheWarmer(
+                {
+                    "league_rosters": get_league_rosters.cache,
+                    "league_scoring": get_league_scoring.cache,
+                },
+                warm_snapshot=warm_snapshot,
+            )
+        elif warm_snapshot:
+            _warmer.warm_snapshot = True
+        _warmer.start()
+        return _warmer
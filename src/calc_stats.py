@@ -1,4 +1,4 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Sequence, Union
 
 import numpy as np
 import pandas as pd
@@ -32,6 +32,94 @@ trad_scoring_values = {
     "ftm": 1,
 }
 
+scoring_systems = {
+    "simple_points": simple_scoring_values,
+    "trad_points": trad_scoring_values,
+}
+
+# per game column for each stat in the scoring dictionaries
+scoring_stat_cols = {
+    "points": "pts_game",
+    "rebounds": "reb_game",
+    "assists": "ast_game",
+    "steals": "stl_game",
+    "blocks": "blk_game",
+    "turnovers": "tov_game",
+    "fga": "fga_game",
+    "fgm": "fgm_game",
+    "fta": "fta_game",
+    "ftm": "ftm_game",
+}
+
+valid_projection_types = (
+    "full_strength",
+    "current",
+    "rest_of_season",
+    "year_to_date",
+)
+
+# per 100 possessions and season total columns behind each per game stat
+per_game_stat_sources = {
+    "pts_game": ("points_100", "points"),
+    "reb_game": ("rebounds_100", "rebounds"),
+    "ast_game": ("assists_100", "assists"),
+    "stl_game": ("steals_100", "steals"),
+    "blk_game": ("blocks_100", "blocks"),
+    "tov_game": ("tov_100", "turnovers"),
+    "fga_game": ("fga_100", "field_goal_attempts"),
+    "fgm_game": ("fgm_100", "field_goals_made"),
+    "fta_game": ("fta_100", "free_throw_attempts"),
+    "ftm_game": ("ftm_100", "free_throws_made"),
+    "fg3a_game": ("fg3a_100", "three_point_attempts"),
+    "fg3m_game": ("fg3m_100", "three_points_made"),
+}
+
+per_game_keep_cols = [
+    "player",
+    "nba_player_id",
+    "ottoneu_player_id",
+    "hashtag_id",
+    "tm_id",
+    "ottoneu_position",
+    "minutes",
+    "games_played",
+    "games_forecast",
+    "minutes_forecast",
+    "total_ros_minutes",
+    "minutes_ytd",
+    "pts_game",
+    "reb_game",
+    "ast_game",
+    "stl_game",
+    "blk_game",
+    "tov_game",
+    "fga_game",
+    "fgm_game",
+    "fg3a_game",
+    "fg3m_game",
+    "fg_pct",
+    "fg3_pct",
+    "fta_game",
+    "ftm_game",
+]
+
+# order of the categories in the SGP kernel, ratio categories last
+sgp_categories = ["pts", "reb", "ast", "stl", "blk", "ftm", "tov", "fg%", "3pt%"]
+# columns of the stats matrix the kernel expects, counting stats first
+sgp_stat_cols = [
+    "pts_game",
+    "reb_game",
+    "ast_game",
+    "stl_game",
+    "blk_game",
+    "ftm_game",
+    "tov_game",
+    "fgm_game",
+    "fga_game",
+    "fg3m_game",
+    "fg3a_game",
+]
+
 
 def calc_per_game_projections(
     df: pd.DataFrame, projection_type: str = "year_to_date"
@@ -44,100 +132,62 @@ def calc_per_game_projections(
     Incorrectly titled for RoS and YTD stats since it's calculating the totals
     for that time period and not just per game.
     """
-    stats_df = df.copy()
-    if projection_type not in (
-        "full_strength",
-        "current",
-        "rest_of_season",
-        "year_to_date",
-    ):
-        raise ValueError(f"{projection_type} is not a valid projection type!")
+    return calc_all_per_game_projections(df, [projection_type])[projection_type]
+
+
+def calc_all_per_game_projections(
+    df: pd.DataFrame, projection_types: Sequence[str]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Calculates the per game projections for each of the projection types in one
+    call, pulling the per 100 stats out of the dataframe once and scaling them by
+    each type's possessions. The input dataframe is not modified.
+    """
+    for projection_type in projection_types:
+        if projection_type not in valid_projection_types:
+            raise ValueError(f"{projection_type} is not a valid projection type!")
+
+    per_game_cols = list(per_game_stat_sources)
+    base_df = df[[col for col in per_game_keep_cols if col not in per_game_cols]]
+    per_100_stats = None
+    projections = dict()
+    for projection_type in projection_types:
+        if projection_type == "year_to_date":
+            # stats are already coming in as totals so don't need to do anything
+            stats = df[[totals for _, totals in per_game_stat_sources.values()]]
+            stats = stats.to_numpy(dtype=float)
+        else:
+            if per_100_stats is None:
+                per_100_stats = df[
+                    [per_100 for per_100, _ in per_game_stat_sources.values()]
+                ].to_numpy(dtype=float)
+            possessions = get_possessions(df, projection_type).to_numpy(dtype=float)
+            # 100 since the stats are on a per 100 possession basis
+            stats = per_100_stats * (possessions / 100)[:, np.newaxis]
+        projections[projection_type] = pd.concat(
+            [base_df, pd.DataFrame(stats, index=df.index, columns=per_game_cols)],
+            axis=1,
+        )[per_game_keep_cols]
+    return projections
+
+
+def get_possessions(df: pd.DataFrame, projection_type: str) -> pd.Series:
+    """
+    Finds the number of possessions each player is projected to play for the
+    projection type. Only meaningful for types built off of per 100 stats.
+    """
     if projection_type == "full_strength":
-        possessions = stats_df.pace * stats_df.fs_min / 48
+        return df.pace * df.fs_min / 48
     elif projection_type == "current":
         # should this be re-labeled?
-        possessions = stats_df.pace * stats_df.minutes / 48
+        return df.pace * df.minutes / 48
     elif projection_type == "rest_of_season":
         # pace = poss / game
         # total_ros_minutes = minutes
         # 48 = 1 game / 48 minutes
         # poss / game * minutes * game / minutes ==> possessions
-        # 100 since the stats are on a per 100 possession basis
-        possessions = (stats_df.pace / 100) * (stats_df.total_ros_minutes / 48)
-
-    if projection_type == "year_to_date":
-        # super hacky but w/e
-        # stats are already coming in as totals so don't need to do anything
-        stats_df["pts_game"] = stats_df.points
-        stats_df["reb_game"] = stats_df.rebounds
-        stats_df["ast_game"] = stats_df.assists
-        stats_df["stl_game"] = stats_df.steals
-        stats_df["blk_game"] = stats_df.blocks
-        stats_df["tov_game"] = stats_df.turnovers
-        stats_df["fga_game"] = stats_df.field_goal_attempts
-        stats_df["fgm_game"] = stats_df.field_goals_made
-        stats_df["fta_game"] = stats_df.free_throw_attempts
-        stats_df["ftm_game"] = stats_df.free_throws_made
-        stats_df["fg3a_game"] = stats_df.three_point_attempts
-        stats_df["fg3m_game"] = stats_df.three_points_made
-    elif projection_type == "rest_of_season":
-        stats_df["pts_game"] = stats_df.points_100 * possessions
-        stats_df["reb_game"] = stats_df.rebounds_100 * possessions
-        stats_df["ast_game"] = stats_df.assists_100 * possessions
-        stats_df["stl_game"] = stats_df.steals_100 * possessions
-        stats_df["blk_game"] = stats_df.blocks_100 * possessions
-        stats_df["tov_game"] = stats_df.tov_100 * possessions
-        stats_df["fga_game"] = stats_df.fga_100 * possessions
-        stats_df["fgm_game"] = stats_df.fgm_100 * possessions
-        stats_df["fta_game"] = stats_df.fta_100 * possessions
-        stats_df["ftm_game"] = stats_df.ftm_100 * possessions
-        stats_df["fg3a_game"] = stats_df.fg3a_100 * possessions
-        stats_df["fg3m_game"] = stats_df.fg3m_100 * possessions
-    else:
-        # don't think I need "possessions_played" anymore
-        stats_df["possessions_played"] = stats_df.pace * stats_df.minutes / 48
-        stats_df["pts_game"] = stats_df.points_100 * possessions / 100
-        stats_df["reb_game"] = stats_df.rebounds_100 * possessions / 100
-        stats_df["ast_game"] = stats_df.assists_100 * possessions / 100
-        stats_df["stl_game"] = stats_df.steals_100 * possessions / 100
-        stats_df["blk_game"] = stats_df.blocks_100 * possessions / 100
-        stats_df["tov_game"] = stats_df.tov_100 * possessions / 100
-        stats_df["fga_game"] = stats_df.fga_100 * possessions / 100
-        stats_df["fgm_game"] = stats_df.fgm_100 * possessions / 100
-        stats_df["fta_game"] = stats_df.fta_100 * possessions / 100
-        stats_df["ftm_game"] = stats_df.ftm_100 * possessions / 100
-        stats_df["fg3a_game"] = stats_df.fg3a_100 * possessions / 100
-        stats_df["fg3m_game"] = stats_df.fg3m_100 * possessions / 100
-
-    keep_cols = [
-        "player",
-        "nba_player_id",
-        "ottoneu_player_id",
-        "hashtag_id",
-        "tm_id",
-        "ottoneu_position",
-        "minutes",
-        "games_played",
-        "games_forecast",
-        "minutes_forecast",
-        "total_ros_minutes",
-        "minutes_ytd",
-        "pts_game",
-        "reb_game",
-        "ast_game",
-        "stl_game",
-        "blk_game",
-        "tov_game",
-        "fga_game",
-        "fgm_game",
-        "fg3a_game",
-        "fg3m_game",
-        "fg_pct",
-        "fg3_pct",
-        "fta_game",
-        "ftm_game",
-    ]
-    return stats_df[keep_cols]
+        return df.pace * (df.total_ros_minutes / 48)
+    raise ValueError(f"{projection_type} does not use possessions!")
 
 
 def calc_fantasy_pts(
@@ -146,23 +196,72 @@ def calc_fantasy_pts(
     """
     Calculates the fantasy points for per game statistics given the scoring type.
     """
-    scoring_dict = simple_scoring_values if is_simple_scoring else trad_scoring_values
+    scoring_type = "simple_points" if is_simple_scoring else "trad_points"
+    return calc_all_fantasy_pts(
+        stats_df, {scoring_type: scoring_systems[scoring_type]}
+    )[scoring_type]
 
-    # fantasy_df = stats_df.copy()
-    return (
-        stats_df["pts_game"] * scoring_dict["points"]
-        + stats_df["reb_game"] * scoring_dict["rebounds"]
-        + stats_df["ast_game"] * scoring_dict["assists"]
-        + stats_df["stl_game"] * scoring_dict["steals"]
-        + stats_df["blk_game"] * scoring_dict["blocks"]
-        + stats_df["tov_game"] * scoring_dict["turnovers"]
-        + stats_df["fga_game"] * scoring_dict["fga"]
-        + stats_df["fgm_game"] * scoring_dict["fgm"]
-        + stats_df["fta_game"] * scoring_dict["fta"]
-        + stats_df["ftm_game"] * scoring_dict["ftm"]
+
+def get_scoring_weights(systems: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Builds the weights matrix for the scoring systems, with a row for each per
+    game stat and a column for each system. Stats a system leaves out are
+    weighted 0.
+    """
+    for name, scoring_dict in systems.items():
+        unknown_stats = set(scoring_dict) - set(scoring_stat_cols)
+        if unknown_stats:
+            raise ValueError(f"{name} has unknown stats: {sorted(unknown_stats)}")
+    return pd.DataFrame(
+        {
+            name: [scoring_dict.get(stat, 0) for stat in scoring_stat_cols]
+            for name, scoring_dict in systems.items()
+        },
+        index=pd.Index(scoring_stat_cols.values()),
+        dtype=float,
+    )
+
+
+def calc_all_fantasy_pts(
+    stats_df: pd.DataFrame, systems: Union[Dict[str, Dict], None] = None
+) -> pd.DataFrame:
+    """
+    Calculates the fantasy points for per game statistics under every scoring
+    system at once, multiplying the stats by the weights matrix. Defaults to
+    simple and trad points, but custom systems can be passed in using the same
+    keys as `simple_scoring_values`. Returns one column per system.
+    """
+    weights = get_scoring_weights(systems or scoring_systems)
+    stats = stats_df[weights.index].to_numpy(dtype=float)
+    return pd.DataFrame(
+        stats @ weights.to_numpy(), index=stats_df.index, columns=weights.columns
     )
 
 
+def add_per_game_rates(
+    df: pd.DataFrame,
+    rate_cols: Dict[str, str],
+    games_col: str,
+    decimals: Union[int, None] = None,
+    fill_value: float = 0,
+) -> pd.DataFrame:
+    """
+    Adds per game rate columns, where `rate_cols` maps each new column to the
+    production column it divides by `games_col`. Players without any games get
+    `fill_value` instead of dividing by zero. Returns the dataframe.
+    """
+    games = df[games_col].to_numpy(dtype=float)
+    has_games = games != 0
+    # swap in 1 for the zeros to avoid dividing by them, they get filled anyway
+    safe_games = np.where(has_games, games, 1)
+    for rate_col, production_col in rate_cols.items():
+        rates = df[production_col].to_numpy(dtype=float) / safe_games
+        if decimals is not None:
+            rates = np.round(rates, decimals)
+        df[rate_col] = np.where(has_games, rates, fill_value)
+    return df
+
+
 def calc_z_score_values():
     roto_cols = [
         "pts_game",
@@ -221,12 +320,15 @@ def calc_z_score_values():
     return value_df
 
 
-def calc_sgp_values(stats_df: pd.DataFrame) -> pd.DataFrame:
+def get_sgp_values() -> Dict[str, float]:
+    """
+    Blends last season's and this season's SGP slopes and team averages,
+    weighted by the current week.
+    """
     # need to 1) get sgp data
     # 2) balance the weeks (22-csw)*lss + csw*css / 22
     # 3)
 
-    df = stats_df.copy()
     NUM_WEEKS = 22
     sgp_rollup = get_sgp_rollup().tail(2)
     current_week = sgp_rollup.week.values.tolist().pop()
@@ -250,35 +352,43 @@ def calc_sgp_values(stats_df: pd.DataFrame) -> pd.DataFrame:
         .div(NUM_WEEKS)
         .sum()
     ).to_dict()
+    return sgp_values
 
-    columns = ["pts", "reb", "ast", "stl", "blk", "ftm", "tov", "fg%", "3pt%"]
-    for col in columns:
-        if col == "fg%":
-            df[f"{col}_sgp"] = df.apply(
-                lambda row: (
-                    (row.fgm_game + sgp_values["avg_team_fgm"])
-                    / (row.fga_game + sgp_values["avg_team_fga"])
-                    - sgp_values["avg_team_fg_pct"]
-                )
-                / sgp_values[col],
-                axis=1,
-            )
-        elif col == "3pt%":
-            df[f"{col}_sgp"] = df.apply(
-                lambda row: (
-                    (row.fg3m_game + sgp_values["avg_team_fg3m"])
-                    / (row.fg3a_game + sgp_values["avg_team_fg3a"])
-                    - sgp_values["avg_team_fg3_pct"]
-                )
-                / sgp_values[col],
-                axis=1,
-            )
-        else:
-            df[f"{col}_sgp"] = df[f"{col}_game"].apply(
-                lambda row: row / sgp_values[col]
-            )
-    df["total_value"] = df[[col for col in df.columns if "sgp" in col]].sum(axis=1)
-    return df
+
+def calc_sgp_values(stats_df: pd.DataFrame, dtype: type = np.float64) -> pd.DataFrame:
+    """
+    Scores each player's production in standings gain points for each of the
+    categories, using the blended SGP values from `get_sgp_values`. Pass
+    `dtype=np.float32` to halve the memory of the scoring for large runs.
+    """
+    sgp_values = get_sgp_values()
+    stats = stats_df[sgp_stat_cols].to_numpy(dtype=dtype)
+    sgp_cols = [f"{col}_sgp" for col in sgp_categories] + ["total_value"]
+    return stats_df.assign(**dict(zip(sgp_cols, calc_sgp_kernel(stats, sgp_values).T)))
+
+
+def calc_sgp_kernel(stats: np.ndarray, sgp_values: Dict) -> np.ndarray:
+    """
+    Scores a stats matrix, with columns ordered as in `sgp_stat_cols`, in
+    standings gain points. Returns a matrix with one column per category in
+    `sgp_categories` followed by the total, keeping the dtype of `stats`.
+    """
+    num_counting = len(sgp_categories) - 2
+    slopes = np.array([sgp_values[col] for col in sgp_categories], dtype=stats.dtype)
+    fgm, fga, fg3m, fg3a = stats[:, num_counting:].T
+
+    sgp = np.empty((stats.shape[0], len(sgp_categories) + 1), dtype=stats.dtype)
+    sgp[:, :num_counting] = stats[:, :num_counting]
+    sgp[:, num_counting] = (fgm + sgp_values["avg_team_fgm"]) / (
+        fga + sgp_values["avg_team_fga"]
+    ) - sgp_values["avg_team_fg_pct"]
+    sgp[:, num_counting + 1] = (fg3m + sgp_values["avg_team_fg3m"]) / (
+        fg3a + sgp_values["avg_team_fg3a"]
+    ) - sgp_values["avg_team_fg3_pct"]
+    sgp[:, :-1] /= slopes
+    # missing stats count as zero towards the total, like DataFrame.sum does
+    sgp[:, -1] = np.nansum(sgp[:, :-1], axis=1)
+    return sgp
 
 
 def calc_categories_value(
@@ -323,33 +433,33 @@ def calc_player_values(
         fantasy_df, scoring_type, draftable_players
     )
 
-    fantasy_df[f"points_above_repl"] = fantasy_df.apply(
-        lambda row: (
-            row[scoring_type] - replacement_values["C"]
-            if row[f"{scoring_type}_position"] == "C"
-            else (
-                row[scoring_type] - replacement_values["F"]
-                if row[f"{scoring_type}_position"] == "F"
-                else row[scoring_type] - replacement_values["G"]
-            )
-        ),
-        axis="columns",
+    fantasy_df["points_above_repl"] = calc_points_above_replacement(
+        fantasy_df, scoring_type, replacement_values
+    )
+
+    above_repl = (fantasy_df.points_above_repl > 0).to_numpy()
+    points_above_repl = fantasy_df.points_above_repl.to_numpy(dtype=float)
+    total_league_value = points_above_repl[above_repl].sum()
+    surplus_factor = (4800 - above_repl.sum()) / total_league_value
+    return pd.Series(
+        np.where(above_repl, np.round(points_above_repl * surplus_factor + 1, 1), 0.0),
+        index=fantasy_df.index,
     )
 
-    total_league_value = fantasy_df.loc[
-        fantasy_df.points_above_repl > 0
-    ].points_above_repl.sum()
-    surplus_factor = (
-        4800 - len(fantasy_df.loc[fantasy_df.points_above_repl > 0])
-    ) / total_league_value
-    return fantasy_df.apply(
-        lambda row: (
-            round(row.points_above_repl * surplus_factor + 1, 1)
-            if row.points_above_repl > 0
-            else 0
-        ),
-        axis=1,
+
+def calc_points_above_replacement(
+    fantasy_df: pd.DataFrame, scoring_type: str, replacement_values: Dict
+) -> pd.Series:
+    """
+    Maps each player's positional replacement value onto their row and subtracts
+    it from their production. Anything that isn't a C or F is measured against
+    the G replacement level.
+    """
+    positions = fantasy_df[f"{scoring_type}_position"]
+    replacement_level = positions.where(positions.isin(["C", "F"]), "G").map(
+        replacement_values
     )
+    return fantasy_df[scoring_type] - replacement_level
 
 
 def calc_sgp_slopes(df: pd.DataFrame) -> dict:
@@ -0,0 +1,123 @@
+"""
+Crawls Ottoneu league pages on a bounded pool of workers. Every request goes
+through the shared Ottoneu client, so the crawl as a whole stays within its
+requests-per-second budget no matter how many workers there are. Each league's
+result is appended to a checkpoint file as soon as it's done, so an
+interrupted crawl picks up where it stopped. Results older than the
+checkpoint's max age are crawled again, so a crawl that never finished doesn't
+leave days old pages behind for the next run.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from http_client import get_client
+
+logging.basicConfig(level=logging.INFO)
+
+CHECKPOINT_DIR = "./data/crawl_checkpoints"
+# a resumed crawl only reuses the results from the last half day
+DEFAULT_MAX_AGE = 12 * 60 * 60
+
+
+def _checkpoint_path(name: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"{name}.jsonl")
+
+
+def _to_json(value):
+    # numpy scalars sneak in from the standings calculations
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Can't checkpoint a {type(value).__name__}!")
+
+
+def load_checkpoint(
+    name: str, max_age: float = DEFAULT_MAX_AGE
+) -> Dict[int, Optional[dict]]:
+    """
+    Loads the leagues crawled in the last `max_age` seconds, keyed by league ID.
+    """
+    results: Dict[int, Optional[dict]] = dict()
+    oldest = time.time() - max_age
+    if not os.path.exists(_checkpoint_path(name)):
+        return results
+    with open(_checkpoint_path(name)) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # the last line can be cut off if the crawl was killed mid-write
+                continue
+            if record.get("crawled_at", 0) < oldest:
+                continue
+            results[record["league_id"]] = record["result"]
+    return results
+
+
+def clear_checkpoint(name: str) -> None:
+    """Removes the checkpoint, so the next crawl starts from scratch."""
+    if os.path.exists(_checkpoint_path(name)):
+        os.remove(_checkpoint_path(name))
+
+
+def crawl_leagues(
+    league_ids: Iterable[int],
+    fetch: Callable[[int], Optional[dict]],
+    checkpoint: str,
+    max_workers: int = 4,
+    rate: Optional[float] = None,
+    max_age: float = DEFAULT_MAX_AGE,
+) -> Dict[int, Optional[dict]]:
+    """
+    Calls `fetch` for each league on up to `max_workers` threads, skipping the
+    leagues in the `checkpoint` crawled within the last `max_age` seconds. `fetch` should return None for a
+    league that doesn't exist, so it's skipped on a resume too. `rate` sets
+    the requests per second budget of the shared client. Returns the results
+    keyed by league ID, in the order of `league_ids`.
+    """
+    league_ids = [int(league_id) for league_id in league_ids]
+    if rate is not None:
+        get_client().set_rate(rate)
+    results = load_checkpoint(checkpoint, max_age=max_age)
+    to_crawl = [league_id for league_id in league_ids if league_id not in results]
+    if len(to_crawl) < len(league_ids):
+        logging.info(
+            f"Resuming {checkpoint} with {len(league_ids) - len(to_crawl)} leagues done"
+        )
+
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, open(
+        _checkpoint_path(checkpoint), "a"
+    ) as f:
+        futures = {
+            executor.submit(fetch, league_id): league_id for league_id in to_crawl
+        }
+        for future in as_completed(futures):
+            league_id = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # the finished leagues are checkpointed, so stop the rest
+                for pending in futures:
+                    pending.cancel()
+                raise
+            results[league_id] = result
+            f.write(
+                json.dumps(
+                    {
+                        "league_id": league_id,
+                        "result": result,
+                        "crawled_at": time.time(),
+                    },
+                    default=_to_json,
+                )
+                + "\n"
+            )
+            f.flush()
+    return {league_id: results[league_id] for league_id in league_ids}
@@ -5,12 +5,14 @@ the projections coming from DARKO.
 
 import pandas as pd
 
+from source_cache import get_source_frame
+
+DARKO_URL = "https://docs.google.com/spreadsheets/d/1mhwOLqPu2F9026EQiVxFPIN1t9RGafGpl-dokaIsm9c/gviz/tq?tqx=out:csv&gid=284274620"
+
 
 def get_current_darko() -> pd.DataFrame:
     """Pulls the current DARKO listed online."""
-    return pd.read_csv(
-        "https://docs.google.com/spreadsheets/d/1mhwOLqPu2F9026EQiVxFPIN1t9RGafGpl-dokaIsm9c/gviz/tq?tqx=out:csv&gid=284274620"
-    )
+    return pd.read_csv(DARKO_URL)
 
 
 def get_darko_fgm(darko_df: pd.DataFrame) -> pd.DataFrame:
@@ -113,3 +115,11 @@ def transform_darko(darko_df: pd.DataFrame) -> pd.DataFrame:
     darko_df.columns = rename_darko_cols(darko_df.columns)
 
     return darko_df
+
+
+def get_transformed_darko() -> pd.DataFrame:
+    """
+    Pulls and transforms the current DARKO, reusing the stored result when the
+    sheet hasn't changed since the last pull.
+    """
+    return get_source_frame("darko", DARKO_URL, pd.read_csv, transform_darko)
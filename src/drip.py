@@ -6,12 +6,14 @@ a per 100 possessions format.
 
 import pandas as pd
 
+from source_cache import get_source_frame
+
+DRIP_URL = "https://dataviz.theanalyst.com/nba-stats-hub/drip.json"
+
 
 def get_current_drip() -> pd.DataFrame:
     """Pulls the current DRIP projections online."""
-    return pd.io.json.read_json(
-        "https://dataviz.theanalyst.com/nba-stats-hub/drip.json"
-    )
+    return pd.io.json.read_json(DRIP_URL)
 
 
 def get_drip_fga(drip_df: pd.DataFrame) -> pd.DataFrame:
@@ -112,3 +114,11 @@ def transform_drip(drip_df: pd.DataFrame) -> pd.DataFrame:
     drip_df.columns = rename_drip_cols(drip_df.columns)
 
     return drip_df
+
+
+def get_transformed_drip() -> pd.DataFrame:
+    """
+    Pulls and transforms the current DRIP projections, reusing the stored
+    result when the feed hasn't changed since the last pull.
+    """
+    return get_source_frame("drip", DRIP_URL, pd.io.json.read_json, transform_drip)
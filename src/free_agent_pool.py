@@ -0,0 +1,108 @@
+"""
+Serves a league's free agents from a pool built once per refresh. The pool is
+every player's rest of season values joined to the Ottoneu average values,
+already sorted by value, so a league lookup is just dropping the league's
+rostered player IDs.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from calc_stats import add_per_game_rates
+from leagues import get_average_values
+from stats_snapshot import get_stats_snapshot
+from valuation_cache import get_snapshot_values, get_valuation_cache
+
+scoring_types = ("simple_points", "trad_points", "categories")
+
+
+def build_free_agent_pool(
+    ros_df: pd.DataFrame, average_values_df: pd.DataFrame, league_scoring: str
+) -> pd.DataFrame:
+    """
+    Builds the free agent table for every player in `ros_df`, which holds the
+    rest of season values with the categories broken out, sorted by value and
+    then projected production. The ottoneu_player_id column is kept as
+    integers, with -1 for players without one, for dropping rostered players.
+    """
+    if league_scoring not in scoring_types:
+        raise ValueError(f"{league_scoring} is not a valid scoring type!")
+    pool = ros_df.fillna(0)
+    # players without any games forecast get dropped before displaying
+    pool = add_per_game_rates(
+        pool,
+        {f"{league_scoring}_ppg": f"{league_scoring}"},
+        games_col="games_forecast",
+        fill_value=np.nan,
+    )
+    pool = pool.merge(average_values_df, how="left", on="ottoneu_player_id")
+    display_cols = [
+        "player",
+        "ottoneu_position",
+        "games_forecast",
+        "total_ros_minutes",
+        f"{league_scoring}",
+        f"{league_scoring}_ppg",
+        f"{league_scoring}_value",
+        "avg_salary",
+        "median_salary",
+        "roster%",
+    ]
+    if league_scoring == "categories":
+        display_cols.extend([col for col in pool.columns if "sgp" in col])
+
+    pool = pool[["ottoneu_player_id"] + display_cols].rename(
+        columns={f"{league_scoring}": f"{league_scoring}_proj_production"}
+    )
+    pool = pool.sort_values(
+        by=[f"{league_scoring}_value", f"{league_scoring}_proj_production"],
+        ascending=False,
+    ).dropna(subset=f"{league_scoring}_ppg")
+    # dropping the categories per game scoring until I come up with a better way
+    # to display it...per 82 games?
+    if league_scoring == "categories":
+        pool = pool.drop(columns=f"{league_scoring}_ppg")
+    # unmapped players were filled with 0 above, which isn't a real ID either
+    player_ids = pool.ottoneu_player_id.to_numpy(dtype=np.int64)
+    pool["ottoneu_player_id"] = np.where(player_ids > 0, player_ids, -1)
+    return pool.set_index("player")
+
+
+def get_free_agent_pool(league_scoring: str) -> pd.DataFrame:
+    """
+    Gets the pool for the scoring type, cached by the stats snapshot and the
+    fetch of the average values it was built from. The frame is shared, so copy
+    it before modifying it.
+    """
+    # the shared average values, so a lookup doesn't copy or hash them
+    average_values = get_average_values.cache.get_entry()
+    key = (
+        get_stats_snapshot().version,
+        average_values.fetched_at,
+        "free_agent_pool",
+        league_scoring,
+    )
+    return get_valuation_cache().get(
+        key,
+        lambda: build_free_agent_pool(
+            get_snapshot_values("rest_of_season", is_rollup=False),
+            average_values.value,
+            league_scoring,
+        ),
+    )
+
+
+def get_free_agents(
+    league_scoring: str, roster_ids: Union[pd.Series, Sequence[int], np.ndarray]
+) -> pd.DataFrame:
+    """
+    Gets the players that aren't on any of the league's rosters, sorted by
+    rest of season value, from the league's rostered Ottoneu player IDs.
+    """
+    pool = get_free_agent_pool(league_scoring)
+    is_free_agent = ~np.isin(
+        pool.ottoneu_player_id.to_numpy(), np.asarray(roster_ids, dtype=np.int64)
+    )
+    return pool.loc[is_free_agent].drop(columns="ottoneu_player_id")
@@ -0,0 +1,99 @@
+"""
+Fetches the raw sources behind the stats concurrently, since each one is an
+independent network round trip. Each source gets retries with backoff on
+dropped connections, timeouts and 429 or 5xx responses, and its own timeout,
+and the time spent on each one is logged and returned.
+"""
+
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Tuple, Union
+from urllib.error import HTTPError, URLError
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_TIMEOUT = 60.0
+
+
+def _is_retryable(err: OSError) -> bool:
+    """
+    Checks if the error could pass on a retry. Other 4xx responses, like a
+    missing source, fail the same way every time.
+    """
+    if isinstance(err, HTTPError):
+        return err.code == 429 or err.code >= 500
+    # socket.timeout is only an alias of TimeoutError from 3.10
+    return isinstance(err, (URLError, ConnectionError, TimeoutError, socket.timeout))
+
+
+def _fetch_with_retries(
+    name: str,
+    fetch: Callable[[], pd.DataFrame],
+    timings: Dict[str, Dict[str, float]],
+    retries: int,
+    backoff: float,
+) -> pd.DataFrame:
+    start = time.perf_counter()
+    attempt = 1
+    while True:
+        try:
+            df = fetch()
+            break
+        except OSError as err:
+            if attempt > retries or not _is_retryable(err):
+                raise
+            logging.warning(f"Attempt {attempt} for {name} failed: {err}")
+            time.sleep(backoff * 2 ** (attempt - 1))
+            attempt += 1
+    timings[name] = {"seconds": time.perf_counter() - start, "attempts": attempt}
+    return df
+
+
+def fetch_sources(
+    sources: Dict[str, Callable[[], pd.DataFrame]],
+    timeouts: Union[Dict[str, float], None] = None,
+    retries: int = 2,
+    backoff: float = 1.0,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict[str, float]]]:
+    """
+    Calls each of the source functions on its own thread. Each source must
+    finish, retries included, within its timeout in `timeouts`, or
+    `DEFAULT_TIMEOUT` seconds, of the start. Returns the frames and the seconds
+    and attempts taken for each source. A source that fails after all of its
+    retries raises its last error.
+    """
+    timeouts = timeouts or dict()
+    timings: Dict[str, Dict[str, float]] = dict()
+    start = time.perf_counter()
+    # not using a with block since it would wait on any timed out threads
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    try:
+        futures = {
+            name: executor.submit(
+                _fetch_with_retries, name, fetch, timings, retries, backoff
+            )
+            for name, fetch in sources.items()
+        }
+        frames = dict()
+        for name, future in futures.items():
+            deadline = start + timeouts.get(name, DEFAULT_TIMEOUT)
+            try:
+                frames[name] = future.result(
+                    timeout=max(deadline - time.perf_counter(), 0)
+                )
+            except FutureTimeoutError:
+                raise TimeoutError(f"Timed out fetching {name}!")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for name, timing in timings.items():
+        logging.info(
+            f"Fetched {name} in {timing['seconds']:.2f}s ({timing['attempts']} attempts)"
+        )
+    logging.info(f"Fetched all sources in {time.perf_counter() - start:.2f}s")
+    return frames, timings
@@ -1,15 +1,17 @@
 import logging
 import os
 import sys
-import time
+from typing import Optional
 
 import pandas as pd
 
 sys.path.append(os.path.abspath("src"))
 logging.basicConfig(level=logging.INFO)
 
+from crawler import clear_checkpoint, crawl_leagues
+from http_client import get_client
 from leagues import get_league_first_year, get_league_settings
-from utils import _setup_gdrive, _upload_data
+from utils import LEAGUES_SHEET_KEY, _setup_gdrive, _upload_data
 
 # 19 total leagues at the moment - 7/16/24
 # or is it 20??? do private leagues (ie league 4) not show up on the
@@ -18,29 +20,36 @@ from utils import _setup_gdrive, _upload_data
 # at least use it as a reference point...just one more call to Ottoneu
 
 
+def get_league_data(league_id: int) -> Optional[dict]:
+    """Gets the league's settings and first season, or None if it's invalid."""
+    logging.info(f"Fetching data for league {league_id}!")
+    try:
+        league_data = get_league_settings(league_id)
+        league_data["created_year"] = get_league_first_year(league_id)
+    except (AttributeError, IndexError):
+        # league is invalid (checking implicitly)
+        # can check if request URL
+        # 'https://ottoneu.fangraphs.com/basketball/?invalidLeague=1'
+        return None
+    return league_data
+
+
 def main():
     client_key_string = os.environ.get("SERVICE_BLOB", None)
-    sheet_key = "14TkjXjFSWDQsHZy6Qt77elLnVpi1HwrpbqzVC4JKDjc"
 
-    leagues_counter = 0
-    num_leagues = 19
-    bad_leagues = 0
+    num_leagues = 20
+    # probe the league IDs a batch at a time until there are enough valid ones
+    batch_size = 8
     league_id = 1
     leagues_data = dict()
-    while leagues_counter <= num_leagues:
-        logging.info(f"Fetching data for league {league_id}!")
-        try:
-            time.sleep(1.3)
-            leagues_data[league_id] = get_league_settings(league_id)
-            time.sleep(1.1)
-            leagues_data[league_id]["created_year"] = get_league_first_year(league_id)
-            leagues_counter += 1
-        except AttributeError:
-            # league is invalid (checking implicitly)
-            # can check if request URL
-            # 'https://ottoneu.fangraphs.com/basketball/?invalidLeague=1'
-            bad_leagues += 1
-        league_id += 1
+    while len(leagues_data) < num_leagues:
+        batch = range(league_id, league_id + batch_size)
+        for batch_id, league_data in crawl_leagues(
+            batch, get_league_data, "leagues_info"
+        ).items():
+            if league_data is not None and len(leagues_data) < num_leagues:
+                leagues_data[batch_id] = league_data
+        league_id += batch_size
 
     league_info_df = (
         pd.DataFrame.from_dict(leagues_data, orient="index")
@@ -49,9 +58,11 @@ def main():
     )
 
     logging.info("Got information for all leagues")
+    get_client().log_latency_stats()
     gc = _setup_gdrive(client_key_string)
 
-    _upload_data(gc, league_info_df, sheet_key)
+    _upload_data(gc, league_info_df, LEAGUES_SHEET_KEY)
+    clear_checkpoint("leagues_info")
 
 
 if __name__ == "__main__":
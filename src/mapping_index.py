@@ -0,0 +1,159 @@
+"""
+Loads the player crosswalk once and serves lookups between its ID spaces
+(Ottoneu, NBA, stats, ESPN and hashtagbasketball) as integer gathers instead of
+merges. The parsed crosswalk is stored at ./data/mapping_index/<hash>.arrow,
+keyed by the SHA-256 of the CSV, so the CSV is only parsed again after it
+changes.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather  # type: ignore
+
+logging.basicConfig(level=logging.INFO)
+
+MAPPINGS_PATH = "./data/mappings_update_2023-09-14.csv"
+MAPPING_CACHE_DIR = "./data/mapping_index"
+# stands in for a player missing from an ID space
+MISSING_ID = -1
+
+id_cols = [
+    "ottoneu_player_id",
+    "nba_player_id",
+    "stats_player_id",
+    "espn_id",
+    "hashtag_id",
+]
+
+
+def load_mappings(path: str = MAPPINGS_PATH) -> pd.DataFrame:
+    """
+    Loads the crosswalk, reading the stored frame if the CSV hasn't changed
+    since it was last parsed. The columns match `pd.read_csv` of the file.
+    """
+    with open(path, "rb") as f:
+        payload = f.read()
+    content_hash = hashlib.sha256(payload).hexdigest()
+    frame_path = os.path.join(MAPPING_CACHE_DIR, f"{content_hash}.arrow")
+    if os.path.exists(frame_path):
+        mappings = feather.read_feather(frame_path)
+        # missing strings come back as None, where the CSV would give NaN
+        return mappings.where(mappings.notna(), np.nan)
+
+    logging.info(f"Parsing the mappings in {path}")
+    mappings = pd.read_csv(io.BytesIO(payload))
+    os.makedirs(MAPPING_CACHE_DIR, exist_ok=True)
+    # write to a unique file then rename, so an interrupted run never leaves a
+    # partial file and concurrent writers don't share one
+    fd, tmp_path = tempfile.mkstemp(dir=MAPPING_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(mappings, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, frame_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    for file_name in os.listdir(MAPPING_CACHE_DIR):
+        if file_name.endswith(".arrow") and not file_name.startswith(content_hash):
+            try:
+                os.remove(os.path.join(MAPPING_CACHE_DIR, file_name))
+            except FileNotFoundError:
+                # already pruned by another writer
+                pass
+    return mappings
+
+
+def to_id_array(ids: Union[pd.Series, Sequence, np.ndarray]) -> np.ndarray:
+    """Converts IDs, which may be floats with NaNs, to integers."""
+    return pd.Series(ids).fillna(MISSING_ID).to_numpy(dtype=np.int64)
+
+
+class MappingIndex:
+    """
+    The crosswalk with a hash index over each of the ID columns. A player
+    missing from an ID space is never matched, and if an ID shows up twice in
+    the crosswalk its first row wins.
+    """
+
+    def __init__(self, mappings: pd.DataFrame):
+        self.mappings = mappings
+        self.ids: Dict[str, np.ndarray] = dict()
+        self._indexes: Dict[str, Tuple[pd.Index, np.ndarray]] = dict()
+        for col in id_cols:
+            ids = to_id_array(mappings[col])
+            is_first = (ids != MISSING_ID) & ~pd.Series(ids).duplicated().to_numpy()
+            self.ids[col] = ids
+            self._indexes[col] = (pd.Index(ids[is_first]), np.flatnonzero(is_first))
+
+    def _gather(self, col: str, rows: np.ndarray) -> np.ndarray:
+        values = self.mappings[col].take(np.maximum(rows, 0))
+        return values.where(rows >= 0).to_numpy()
+
+    def get_rows(
+        self, ids: Union[pd.Series, Sequence, np.ndarray], id_col: str
+    ) -> np.ndarray:
+        """Finds the crosswalk row of each ID, with -1 for unknown IDs."""
+        if id_col not in self._indexes:
+            raise ValueError(f"{id_col} is not one of the ID columns!")
+        index, rows = self._indexes[id_col]
+        positions = index.get_indexer(to_id_array(ids))
+        return np.where(positions >= 0, rows[positions], -1)
+
+    def translate(
+        self, ids: Union[pd.Series, Sequence, np.ndarray], from_col: str, to_col: str
+    ) -> np.ndarray:
+        """
+        Looks up the `to_col` value of each ID in `from_col`, e.g. the NBA IDs
+        for a list of Ottoneu IDs. Unknown IDs get NaN, like a left merge.
+        """
+        return self._gather(to_col, self.get_rows(ids, from_col))
+
+    def lookup(self, player_id: int, from_col: str, to_col: str) -> Optional[object]:
+        """Looks up one player's `to_col` value, or None if it's unknown."""
+        value = self.translate([player_id], from_col, to_col)[0]
+        return None if pd.isna(value) else value
+
+    def add_columns(
+        self,
+        df: pd.DataFrame,
+        on: str,
+        cols: Optional[Sequence[str]] = None,
+        id_col: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Adds the crosswalk's `cols` to the dataframe, matching its `on` column
+        to the `id_col` ID space (defaults to `on`), in place of a left merge.
+        Defaults to every crosswalk column the dataframe doesn't already have.
+        """
+        if cols is None:
+            cols = [col for col in self.mappings.columns if col not in df.columns]
+        rows = self.get_rows(df[on], id_col or on)
+        return df.assign(**{col: self._gather(col, rows) for col in cols})
+
+
+_index: Optional[MappingIndex] = None
+_index_stamp: Optional[Tuple[str, float, int]] = None
+_index_lock = threading.Lock()
+
+
+def get_mapping_index(path: str = MAPPINGS_PATH) -> MappingIndex:
+    """
+    Gets the index shared by everything in the process, rebuilding it if the
+    CSV has been modified since it was loaded.
+    """
+    global _index, _index_stamp
+    stat = os.stat(path)
+    stamp = (path, stat.st_mtime, stat.st_size)
+    with _index_lock:
+        if _index is None or _index_stamp != stamp:
+            _index = MappingIndex(load_mappings(path))
+            _index_stamp = stamp
+        return _index
@@ -1,9 +1,9 @@
 import datetime
 
-import pandas as pd
 import streamlit as st
 
 from pipeline import ottobasket_values_pipeline  # type: ignore
+from utils import get_values_df, get_values_run_date  # type: ignore
 
 st.set_page_config(page_title="Ottobasket Values")
 st.sidebar.markdown("Ottobasket Values")
@@ -15,14 +15,8 @@ def convert_df(df):
 
 
 st.title("Ottobasket Player Values")
-sheet_id = "1GgwZpflcyoRYMP0yL2hrbNwndJjVFm34x3jXnUooSfA"
-values_df = pd.read_csv(
-    f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-)
-
-most_recent_run_date = pd.read_csv(
-    f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=1905916816"
-).values[0][0]
+values_df = get_values_df()
+most_recent_run_date = get_values_run_date()
 
 format_cols = {
     col: "${:.0f}" if "value" in col else "{:.0f}"
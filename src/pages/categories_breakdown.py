@@ -4,10 +4,11 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 
+from cache_warmer import start_cache_warmer  # type: ignore
 from calc_stats import (calc_categories_value,  # type: ignore
                         calc_per_game_projections)
 from leagues import get_league_rosters  # type: ignore
-from transform import prep_stats_df  # type: ignore
+from stats_snapshot import get_stats_df  # type: ignore
 
 
 # from utils import convert_df, ottoneu_streamlit_footer
@@ -17,9 +18,10 @@ def convert_df(df):
 
 
 st.markdown("# Categories Value Breakdown")
+start_cache_warmer()
 
 
-stats_df = prep_stats_df()
+stats_df = get_stats_df()
 
 league_input = st.sidebar.number_input("League ID", placeholder="1", min_value=1)
 if league_input:
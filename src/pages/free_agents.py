@@ -6,10 +6,12 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 
+from cache_warmer import start_cache_warmer  # type: ignore
+from free_agent_pool import get_free_agents  # type: ignore
 from leagues import get_league_rosters  # type: ignore
-from leagues import get_average_values, get_league_scoring
+from leagues import get_league_scoring
 from pipeline import ottobasket_values_pipeline  # type: ignore
-from transform import get_scoring_minutes_combo, prep_stats_df  # type: ignore
+from valuation_cache import get_snapshot_values  # type: ignore
 
 
 def ottoneu_streamlit_footer():
@@ -47,8 +49,7 @@ def select_format(x):
         return "{}"
 
 
-stats_df = prep_stats_df()
-
+start_cache_warmer()
 league_input = st.sidebar.number_input("League ID", placeholder="1", min_value=1)
 if league_input:
     try:
@@ -58,64 +59,15 @@ if league_input:
     except pd.errors.ParserError:
         st.error("Invalid league ID. Try again!")
 
-    ros_df = get_scoring_minutes_combo("rest_of_season", stats_df, is_rollup=False)
+    ros_df = get_snapshot_values("rest_of_season", is_rollup=False)
     format_cols = {col: select_format(col) for col in ros_df.columns}
 
-    league_values_df = ros_df.merge(league_salaries, on="ottoneu_player_id", how="left")
-    league_values_df = league_values_df.loc[league_values_df.salary.isna()].copy()
-    league_values_df.player.fillna(league_values_df.player_name, inplace=True)
-    league_values_df.ottoneu_position.fillna(league_values_df.position, inplace=True)
-    # fill the rest of columns NA's with 0
-    league_values_df.fillna(0, inplace=True)
-    if league_scoring == "categories":
-        scoring_col = f"{league_scoring}_value"
-    elif league_scoring == "simple_points":
-        scoring_col = f"{league_scoring}_value"
-    else:
+    if league_scoring not in ("categories", "simple_points"):
         # Ottoneu has it as "traditional_points", need to shorten it to be consistent
         league_scoring = "trad_points"
-        scoring_col = "trad_points_value"
-    league_values_df[f"{league_scoring}_ppg"] = (
-        league_values_df[f"{league_scoring}"] / league_values_df.games_forecast
-    )
-    average_values_df = get_average_values()
-    league_values_df = league_values_df.merge(
-        average_values_df, how="left", on="ottoneu_player_id"
-    )
-    display_cols = [
-        "player",
-        "ottoneu_position",
-        "games_forecast",
-        "total_ros_minutes",
-        f"{league_scoring}",
-        f"{league_scoring}_ppg",
-        f"{league_scoring}_value",
-        "avg_salary",
-        "median_salary",
-        "roster%",
-    ]
-
-    if league_scoring == "categories":
-        display_cols.extend([col for col in league_values_df.columns if "sgp" in col])
-
-    print(league_values_df.columns)
-    display_df = league_values_df[display_cols].rename(
-        columns={f"{league_scoring}": f"{league_scoring}_proj_production"}
-    )
-
-    display_df.sort_values(
-        by=[f"{league_scoring}_value", f"{league_scoring}_proj_production"],
-        ascending=False,
-        inplace=True,
-    )
-    display_df.dropna(subset=f"{league_scoring}_ppg", inplace=True)
-    display_df.set_index(
-        "player", inplace=True
-    )  # .reset_index(drop=True, inplace=True)
-    # dropping the categories per game scoring until I come up with a better way
-    # to display it...per 82 games?
-    if league_scoring == "categories":
-        display_df.drop(f"{league_scoring}_ppg", axis=1, inplace=True)
+    # the free agent pool is built once per refresh, so this only drops the
+    # league's rostered players from it
+    display_df = get_free_agents(league_scoring, league_salaries.ottoneu_player_id)
     format_cols.update(
         {
             f"{league_scoring}_proj_production": "{:.1f}",
@@ -5,10 +5,13 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
+from cache_warmer import start_cache_warmer
 from calc_stats import calc_categories_value, calc_fantasy_pts
-from transform import get_scoring_minutes_combo, prep_stats_df
+from stats_snapshot import get_stats_df
+from valuation_cache import get_snapshot_values
 
 st.markdown("# Replacement Level Frontier")
+start_cache_warmer()
 
 scoring_input = st.sidebar.radio(
     "Scoring Format", ["Simple Points", "Traditional Points", "Categories"], 0
@@ -19,8 +22,9 @@ scoring_map = {
     "Categories": "categories",
 }
 scoring_type = scoring_map[scoring_input]
-stats_df = prep_stats_df()
-ros_df = get_scoring_minutes_combo("rest_of_season", stats_df)
+ros_df = get_snapshot_values("rest_of_season")
+# the snapshot is shared with the other pages, so work on a copy
+stats_df = get_stats_df().copy()
 # get projected minutes, per 100 stats fantasy value, and if they are
 # projected to be above replacement value
 stats_df.columns = [col.replace("_100", "_game") for col in stats_df.columns]
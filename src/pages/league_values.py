@@ -4,11 +4,15 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 
+from cache_warmer import start_cache_warmer  # type: ignore
 from leagues import get_league_rosters, get_league_scoring  # type: ignore
 from pipeline import ottobasket_values_pipeline  # type: ignore
 from transform import get_roster_depth  # type: ignore
+from utils import get_values_df  # type: ignore
 
 st.markdown("# League Values")
+# keeps the popular leagues warm without building the stats snapshot
+start_cache_warmer(warm_snapshot=False)
 st.sidebar.markdown("# League Values")
 
 
@@ -25,10 +29,7 @@ def find_format_cols(df):
     }
 
 
-sheet_id = "1GgwZpflcyoRYMP0yL2hrbNwndJjVFm34x3jXnUooSfA"
-values_df = pd.read_csv(
-    f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-)
+values_df = get_values_df()
 
 
 league_input = st.sidebar.number_input("League ID", placeholder="1", min_value=1)
@@ -16,7 +16,8 @@ from great_tables import GT, loc, style
 sys.path.append(os.path.abspath("src"))
 
 from leagues import get_league_leaderboard
-from utils import get_last_night_stats, get_name_map
+from mapping_index import get_mapping_index
+from utils import get_last_night_stats
 
 
 def get_player_headshot(nba_id: int):
@@ -27,16 +28,16 @@ def get_player_headshot(nba_id: int):
 
 df = get_last_night_stats(sheet_num=0)
 yesterday = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
-mappings = get_name_map()
-df = df.merge(mappings, on="ottoneu_player_id", how="left")
+mapping_index = get_mapping_index()
+df = mapping_index.add_columns(df, "ottoneu_player_id")
 
 st.title("Last Night's Top Performers")
 st.subheader(f"{yesterday}")
 
 st.header("Six Picks")
 six_picks_df = get_last_night_stats(sheet_num=1)
-six_picks_df = six_picks_df.merge(
-    mappings[["ottoneu_player_id", "nba_player_id"]], on="ottoneu_player_id", how="left"
+six_picks_df["nba_player_id"] = mapping_index.translate(
+    six_picks_df.ottoneu_player_id, "ottoneu_player_id", "nba_player_id"
 )
 # six_picks_df["player_headshot"] = six_picks_df.nba_player_id.apply(lambda x: get_player_headshot(x))
 
@@ -16,9 +16,12 @@ import streamlit as st
 import darko
 # all of the relative imports here
 import drip
+from artifacts import save_artifact  # type: ignore
+from calc_stats import add_per_game_rates  # type: ignore
 ## not ideal, but will figure it out later
-from transform import get_scoring_minutes_combo, prep_stats_df  # type: ignore
-from utils import _setup_gdrive, _upload_data  # type: ignore
+from transform import get_multi_horizon_values, prep_stats_df  # type: ignore
+from utils import (VALUES_ARTIFACT, VALUES_SHEET_KEY,  # type: ignore
+                   _setup_gdrive, _upload_data)
 
 logging.basicConfig(level=logging.INFO)
 
@@ -27,27 +30,31 @@ parser = argparse.ArgumentParser()
 parser.add_argument(
     "-s",
     "--save_method",
-    help="Where to save the data. Local, GDrive, or not at all.",
+    help="Where to save the data. Local store, GDrive (and local), or not at all.",
     choices=["local", "gdrive"],
     type=str,
 )
+parser.add_argument(
+    "--incremental_ytd",
+    help="Add the games since the last run to the stored year to date totals.",
+    action="store_true",
+)
+parser.add_argument(
+    "--incremental_values",
+    help="Only revalue the players whose inputs changed since the last run.",
+    action="store_true",
+)
 
 
 # code for the pipeline here
 @st.cache_data(ttl=12 * 60 * 60)  # type: ignore
 def ottobasket_values_pipeline(
-    save_method: Union[str, None] = "local", filter_cols: bool = True
+    save_method: Union[str, None] = "local",
+    filter_cols: bool = True,
+    incremental_ytd: bool = False,
+    incremental_values: bool = False,
 ) -> Union[None, pd.DataFrame]:
-    stats_df = prep_stats_df()
-
-    # current
-    current_minutes_df = get_scoring_minutes_combo("current", stats_df)
-
-    # rest of season
-    ros_df = get_scoring_minutes_combo("rest_of_season", stats_df)
-
-    # year to date
-    ytd_df = get_scoring_minutes_combo("year_to_date", stats_df)
+    stats_df = prep_stats_df(incremental_ytd=incremental_ytd)
 
     join_cols = [
         "player",
@@ -59,11 +66,12 @@ def ottobasket_values_pipeline(
         "total_ros_minutes",
         "minutes_ytd",
     ]
-    all_values_df = current_minutes_df.merge(
-        ros_df, how="left", on=join_cols, suffixes=("", "_ros")
-    ).merge(ytd_df, how="left", on=join_cols, suffixes=("", "_ytd"))
-    # need to rename the columns from the base dataframe in the merge
-    # to accurately reflect their source
+    # current, rest of season, and year to date side by side with suffixes
+    all_values_df = get_multi_horizon_values(
+        stats_df, join_cols, incremental=incremental_values
+    )
+    # the current values don't get a suffix, so rename them to accurately
+    # reflect their source
     all_values_df.rename(
         columns={
             "simple_points_value": "simple_points_value_current",
@@ -78,41 +86,34 @@ def ottobasket_values_pipeline(
             + [col for col in all_values_df.columns if "value" in col]
             + ["games_forecast_ros", "trad_points_ros", "simple_points_ros"]
         ]
-    all_values_df["tfppg_ros"] = all_values_df.apply(
-        lambda row: (
-            round(row.trad_points_ros / row.games_forecast_ros, 2)
-            if row.games_forecast_ros != 0
-            else 0
-        ),
-        axis=1,
-    )
-    all_values_df["sfppg_ros"] = all_values_df.apply(
-        lambda row: (
-            round(row.simple_points_ros / row.games_forecast_ros, 2)
-            if row.games_forecast_ros != 0
-            else 0
-        ),
-        axis=1,
+    all_values_df = add_per_game_rates(
+        all_values_df,
+        {"tfppg_ros": "trad_points_ros", "sfppg_ros": "simple_points_ros"},
+        games_col="games_forecast_ros",
+        decimals=2,
     )
+    # the horizons share rows so this only catches duplicates in the sources
     all_values_df.drop_duplicates(inplace=True)
     all_values_df = all_values_df.loc[
         (all_values_df.total_ros_minutes > 0) | (all_values_df.minutes_ytd > 0)
     ].fillna(0)
 
-    if save_method == "local":
+    run_time = datetime.now(tz=ZoneInfo("US/Pacific"))
+    if save_method in ("local", "gdrive"):
         logging.info("Saving locally!")
-        all_values_df.to_csv("./data/all_values_df.csv", index=False)
-    elif save_method == "gdrive":
+        version = save_artifact(all_values_df, VALUES_ARTIFACT, run_time=run_time)
+        logging.info(f"Saved values version {version}")
+    if save_method == "gdrive":
+        # the app reads from the sheet when it doesn't have a recent local run
         logging.info("Uploading to GDrive!")
         client_key_string = os.environ.get("SERVICE_BLOB", None)
         gc = _setup_gdrive(client_key_string)
-        sheet_key = "1GgwZpflcyoRYMP0yL2hrbNwndJjVFm34x3jXnUooSfA"
-        _upload_data(gc, all_values_df, sheet_key, clear=True)
+        _upload_data(gc, all_values_df, VALUES_SHEET_KEY, clear=True)
 
         # add the run date
-        now = datetime.now(tz=ZoneInfo("US/Pacific")).strftime("%Y-%m-%d %H:%M:%S")
+        now = run_time.strftime("%Y-%m-%d %H:%M:%S")
         now_df = pd.DataFrame([now], columns=["most_recent_run"])
-        _upload_data(gc, now_df, sheet_key, wks_num=1, clear=False)
+        _upload_data(gc, now_df, VALUES_SHEET_KEY, wks_num=1, clear=False)
     return all_values_df
 
 
@@ -121,7 +122,12 @@ def main():
     command_args = dict(vars(args))
     save_method = command_args.pop("save_method", None)
     logging.info(f"Save method is {save_method}")
-    ottobasket_values_pipeline(save_method, filter_cols=True)
+    ottobasket_values_pipeline(
+        save_method,
+        filter_cols=True,
+        incremental_ytd=args.incremental_ytd,
+        incremental_values=args.incremental_values,
+    )
 
 
 if __name__ == "__main__":
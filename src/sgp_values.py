@@ -2,7 +2,8 @@ import argparse
 import logging
 import os
 import sys
-import time
+from functools import partial
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -13,6 +14,8 @@ sys.path.append(os.path.abspath("src"))
 
 from calc_stats import (calc_per_game_projections, calc_player_values,
                         calc_sgp_slopes, ratio_stat_sgp)
+from crawler import clear_checkpoint, crawl_leagues
+from http_client import get_client
 from leagues import get_schedule_week, get_standings_page
 from transform import (find_surplus_positions, get_draftable_players,
                        prep_stats_df)
@@ -22,6 +25,32 @@ from utils import (_setup_gdrive, _upload_data, get_existing_sgp_data,
 logging.basicConfig(level=logging.INFO)
 
 
+def get_league_sgp_data(league_id: int, season: str) -> Optional[dict]:
+    """Gets the SGP slopes and ratio stat averages from the league's standings."""
+    try:
+        logging.info(f"Getting data for league {league_id}!")
+        standings_df = get_standings_page(league_id, season)
+    except IndexError:
+        logging.info(
+            f"League {league_id} is either private or did not exist in {season}!"
+        )
+        return None
+    sgp_slopes = calc_sgp_slopes(standings_df)
+    sgp_ratios = ratio_stat_sgp(standings_df)
+    sgp_data = dict(sgp_slopes)
+    sgp_data["league_id"] = league_id
+
+    # HOW TO ASSIGN SEASON?
+    sgp_data["season"] = season
+    sgp_data["avg_team_fga"] = sgp_ratios[0][0]
+    sgp_data["avg_team_fgm"] = sgp_ratios[0][1]
+    sgp_data["avg_team_fg_pct"] = sgp_ratios[0][2]
+    sgp_data["avg_team_fg3a"] = sgp_ratios[1][0]
+    sgp_data["avg_team_fg3m"] = sgp_ratios[1][1]
+    sgp_data["avg_team_fg3_pct"] = sgp_ratios[1][2]
+    return sgp_data
+
+
 def main():
     leagues_metadata = get_leagues_metadata()
     sgp_records = get_existing_sgp_data()
@@ -35,34 +64,14 @@ def main():
         leagues_metadata.points_system == "Categories"
     ].league_id.tolist()
 
-    leagues_sgp_data = list()
-    for league_id in cats_leagues:
-        # functionalize?
-        time.sleep(1.3)
-        try:
-            logging.info(f"Getting data for league {league_id}!")
-            standings_df = get_standings_page(league_id, SEASON)
-        except IndexError:
-            logging.info(
-                f"League {league_id} is either private or did not exist in {SEASON}!"
-            )
-            continue
-        sgp_slopes = calc_sgp_slopes(standings_df)
-        sgp_ratios = ratio_stat_sgp(standings_df)
-        sgp_data = pd.Series(sgp_slopes)
-        sgp_data["league_id"] = league_id
-
-        # HOW TO ASSIGN SEASON?
-        sgp_data["season"] = SEASON
-        sgp_data["avg_team_fga"] = sgp_ratios[0][0]
-        sgp_data["avg_team_fgm"] = sgp_ratios[0][1]
-        sgp_data["avg_team_fg_pct"] = sgp_ratios[0][2]
-        sgp_data["avg_team_fg3a"] = sgp_ratios[1][0]
-        sgp_data["avg_team_fg3m"] = sgp_ratios[1][1]
-        sgp_data["avg_team_fg3_pct"] = sgp_ratios[1][2]
-        leagues_sgp_data.append(sgp_data)
-
-    current_sgp_df = pd.concat(leagues_sgp_data, axis=1).T
+    checkpoint = f"sgp_values_{SEASON}"
+    leagues_sgp_data = crawl_leagues(
+        cats_leagues, partial(get_league_sgp_data, season=SEASON), checkpoint
+    )
+    get_client().log_latency_stats()
+    current_sgp_df = pd.DataFrame(
+        [sgp_data for sgp_data in leagues_sgp_data.values() if sgp_data is not None]
+    )
 
     client_key_string = os.environ.get("SERVICE_BLOB", None)
     gc = _setup_gdrive(client_key_string)
@@ -84,6 +93,8 @@ def main():
         sheet_key,
         wks_num=1,
     )
+    # everything is uploaded, so the next refresh should crawl from scratch
+    clear_checkpoint(checkpoint)
     ### for next steps (separate script? or part of main pipeline?)
     ### get week. get sgp_records.
     ### weighted average of last two seasons: week_num - 1 = current_wt. num_weeks (22) - current_wt = last_season_wt
@@ -0,0 +1,186 @@
+"""
+A disk cache for the raw source payloads (DARKO, DRIP, hashtagbasketball).
+Each payload is stored at ./data/raw_sources/<name>/<hash>.raw, keyed by the
+SHA-256 of its contents, along with the ETag and Last-Modified headers of the
+last response so later requests can be conditional. The parsed and transformed
+frame is stored next to it as <hash>-<steps>.arrow, keyed by the payload and
+the source of the modules the parse and transform functions live in, so an
+unchanged payload skips the parsing and transforming altogether until either
+function or a helper next to it changes.
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pandas as pd
+import pyarrow.feather as feather  # type: ignore
+
+logging.basicConfig(level=logging.INFO)
+
+SOURCE_CACHE_DIR = "./data/raw_sources"
+DEFAULT_TIMEOUT = 60.0
+
+
+def _source_dir(name: str) -> str:
+    return os.path.join(SOURCE_CACHE_DIR, name)
+
+
+def _read_metadata(name: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(_source_dir(name), "metadata.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return dict()
+
+
+def _replace_atomic(path: str, write: Callable[[str], None]) -> None:
+    """
+    Calls `write` with a unique temporary path next to `path` and then renames
+    it over `path`, so an interrupted run never leaves a partial file and
+    concurrent writers never write to the same file.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+    _replace_atomic(path, write)
+
+
+def _steps_version(version: str, *steps: Optional[Callable]) -> str:
+    """
+    Hashes the version along with the name of each processing step and the
+    source of its whole module, so a frame stored by an older version of a step
+    or of a helper in its module isn't reused.
+    """
+    steps_hash = hashlib.sha256(version.encode())
+    for step in steps:
+        if step is None:
+            steps_hash.update(b"None")
+            continue
+        steps_hash.update(f"{step.__module__}.{step.__qualname__}".encode())
+        try:
+            steps_hash.update(inspect.getsource(inspect.getmodule(step)).encode())
+        except (OSError, TypeError):
+            # builtins and the like have no source, so fall back to the name
+            pass
+    return steps_hash.hexdigest()[:12]
+
+
+def _prune_payloads(name: str, keep_hash: str, num_keep: int) -> None:
+    source_dir = _source_dir(name)
+    payloads: List[Tuple[float, str]] = sorted(
+        (os.path.getmtime(os.path.join(source_dir, file_name)), file_name)
+        for file_name in os.listdir(source_dir)
+        if file_name.endswith(".raw") and not file_name.startswith(keep_hash)
+    )
+    for _, file_name in payloads[: max(len(payloads) - num_keep + 1, 0)]:
+        content_hash = file_name.removesuffix(".raw")
+        # the payload along with every frame stored from it
+        for stale_name in os.listdir(source_dir):
+            if stale_name.startswith(content_hash):
+                os.remove(os.path.join(source_dir, stale_name))
+
+
+def fetch_raw_source(
+    name: str, url: str, timeout: float = DEFAULT_TIMEOUT, num_keep: int = 3
+) -> Tuple[bytes, str]:
+    """
+    Fetches the payload for the source, sending the cached ETag and
+    Last-Modified headers so an unchanged source can answer with a 304 and
+    nothing to download. Returns the payload and its content hash.
+    """
+    metadata = _read_metadata(name)
+    cached_path = os.path.join(_source_dir(name), f"{metadata.get('hash')}.raw")
+    headers = dict()
+    if os.path.exists(cached_path):
+        if "etag" in metadata:
+            headers["If-None-Match"] = metadata["etag"]
+        if "last_modified" in metadata:
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+            payload = response.read()
+            response_headers = response.headers
+    except HTTPError as err:
+        if err.code != 304:
+            raise
+        logging.info(f"{name} is unchanged since the last request")
+        with open(cached_path, "rb") as f:
+            return f.read(), metadata["hash"]
+
+    content_hash = hashlib.sha256(payload).hexdigest()
+    os.makedirs(_source_dir(name), exist_ok=True)
+    payload_path = os.path.join(_source_dir(name), f"{content_hash}.raw")
+    if not os.path.exists(payload_path):
+        _write_atomic(payload_path, payload)
+    metadata = {"hash": content_hash}
+    if response_headers.get("ETag"):
+        metadata["etag"] = response_headers["ETag"]
+    if response_headers.get("Last-Modified"):
+        metadata["last_modified"] = response_headers["Last-Modified"]
+    _write_atomic(
+        os.path.join(_source_dir(name), "metadata.json"),
+        json.dumps(metadata).encode(),
+    )
+    _prune_payloads(name, content_hash, num_keep)
+    return payload, content_hash
+
+
+def get_source_frame(
+    name: str,
+    url: str,
+    parse: Callable[[io.BytesIO], pd.DataFrame],
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    steps_version: str = "",
+) -> pd.DataFrame:
+    """
+    Gets the source's frame, parsed from the payload with `parse` and then run
+    through `transform`. If the payload's hash matches one already processed by
+    the same `parse` and `transform`, the stored frame is loaded instead. The
+    functions are compared by the source of their modules, so bump
+    `steps_version` after changing a helper they call from another module.
+    """
+    payload, content_hash = fetch_raw_source(name, url, timeout=timeout)
+    frame_key = _steps_version(steps_version, parse, transform)
+    frame_path = os.path.join(_source_dir(name), f"{content_hash}-{frame_key}.arrow")
+    if os.path.exists(frame_path):
+        logging.info(f"Loading the stored {name} frame for {content_hash[:12]}")
+        return feather.read_feather(frame_path)
+
+    df = parse(io.BytesIO(payload))
+    if transform is not None:
+        df = transform(df)
+    try:
+        _replace_atomic(
+            frame_path,
+            lambda tmp_path: feather.write_feather(
+                df, tmp_path, compression="uncompressed"
+            ),
+        )
+    except (ValueError, TypeError) as err:
+        # pyarrow can't store every frame, e.g. mixed types in one column
+        logging.warning(f"Could not store the {name} frame: {err}")
+    return df
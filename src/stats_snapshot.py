@@ -0,0 +1,110 @@
+"""
+Shares one prepared stats frame across every page and session in the process.
+The frame is built with `prep_stats_df` at most once per refresh window, and
+each build gets a version ID from a hash of its contents, so anything derived
+from the stats can be keyed by the version instead of hashing the frame.
+
+The frame is shared, not copied, so callers must copy it before modifying it.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from transform import prep_stats_df
+
+logging.basicConfig(level=logging.INFO)
+
+SNAPSHOT_TTL = 12 * 60 * 60
+# how long to keep serving the old snapshot after a failed rebuild
+RETRY_SECONDS = 10 * 60
+
+
+class StatsSnapshot(NamedTuple):
+    version: str
+    built_at: float
+    stats_df: pd.DataFrame
+
+
+def get_frame_version(df: pd.DataFrame) -> str:
+    """Hashes the frame's contents, index and column names into a short ID."""
+    content_hash = hashlib.sha256(
+        pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+    )
+    content_hash.update(",".join(map(str, df.columns)).encode())
+    return content_hash.hexdigest()[:16]
+
+
+_snapshot: Optional[StatsSnapshot] = None
+_next_build: float = 0.0
+# only held while building, so readers of the current snapshot never wait on
+# a rebuild
+_build_lock = threading.Lock()
+
+
+def _build_snapshot() -> None:
+    global _snapshot, _next_build
+    now = time.time()
+    try:
+        stats_df = prep_stats_df()
+    except Exception as err:
+        if _snapshot is None:
+            raise
+        logging.warning(
+            f"Could not rebuild the stats, serving version {_snapshot.version}: {err}"
+        )
+        _next_build = now + RETRY_SECONDS
+    else:
+        _snapshot = StatsSnapshot(get_frame_version(stats_df), now, stats_df)
+        logging.info(f"Built stats snapshot {_snapshot.version}")
+
+
+def get_stats_snapshot(max_age: float = SNAPSHOT_TTL) -> StatsSnapshot:
+    """
+    Gets the shared stats snapshot, building it if there isn't one or it's
+    older than `max_age` seconds. Only one caller builds at a time, and the
+    rest wait for its result. If a rebuild fails, the old snapshot is served
+    for another `RETRY_SECONDS` before trying again.
+    """
+    snapshot = _snapshot
+    if snapshot is not None and time.time() - snapshot.built_at <= max_age:
+        return snapshot
+    with _build_lock:
+        now = time.time()
+        if _snapshot is None or (
+            now - _snapshot.built_at > max_age and now >= _next_build
+        ):
+            _build_snapshot()
+        return _snapshot
+
+
+def refresh_stats_snapshot() -> StatsSnapshot:
+    """
+    Rebuilds the snapshot ahead of its expiry. The current snapshot is served
+    to everyone else until the new one is ready.
+    """
+    with _build_lock:
+        _build_snapshot()
+        return _snapshot
+
+
+def peek_stats_snapshot() -> Optional[StatsSnapshot]:
+    """Gets the current snapshot, if there is one, without building it."""
+    return _snapshot
+
+
+def get_stats_df() -> pd.DataFrame:
+    """Gets the shared, read-only stats frame. Copy it before modifying it."""
+    return get_stats_snapshot().stats_df
+
+
+def clear_stats_snapshot() -> None:
+    """Drops the snapshot, so the next call rebuilds it."""
+    global _snapshot, _next_build
+    with _build_lock:
+        _snapshot = None
+        _next_build = 0.0
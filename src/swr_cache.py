@@ -0,0 +1,232 @@
+"""
+A process-wide cache for the Ottoneu league lookups that many sessions ask
+for at once. Concurrent misses for the same arguments wait on one in-flight
+call instead of each making their own request ("single flight"), and an
+expired entry keeps being served while a single background call refreshes it
+("stale while revalidate"), so a traffic spike after the TTL never turns into
+a burst of requests to Ottoneu. Waits on another caller's call are bounded, and
+a failed background refresh isn't retried until `retry_seconds` later.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import (Any, Callable, Dict, Hashable, List, NamedTuple, Optional,
+                    Tuple)
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+
+# shared by every cached function, so refreshes are spread over few threads
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="refresh")
+
+# how long to wait on a call made by another caller
+DEFAULT_WAIT_TIMEOUT = 60.0
+# how long to keep serving the stale value after a failed refresh
+DEFAULT_RETRY_SECONDS = 5 * 60
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    # when the value was fetched, by the cache's clock, which also serves as
+    # its version
+    fetched_at: float
+
+
+class SWRCache:
+    """
+    Caches `func`'s results by its arguments. An entry is fresh for `ttl`
+    seconds and is then served stale, while it's refreshed in the background,
+    for up to `stale_ttl` more seconds. Past that, the caller waits on the
+    call like a miss. DataFrames are copied on the way out, like
+    `st.cache_data`, so callers can modify them.
+
+    Only the `max_entries` most recently used entries are kept. The request
+    counts behind `most_requested` are halved every `decay_every` requests,
+    dropping keys that fall to zero, so they favor recent traffic and don't
+    grow with every key ever asked for.
+
+    Waiting on a call in flight from another caller, or on a queued background
+    refresh, raises a TimeoutError after `wait_timeout` seconds, and the next
+    caller makes its own call. After a background refresh fails, the stale
+    value is served for `retry_seconds` before refreshing again.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        ttl: float,
+        stale_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_entries: int = 256,
+        decay_every: int = 1000,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+    ):
+        self.func = func
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self.decay_every = decay_every
+        self.wait_timeout = wait_timeout
+        self.retry_seconds = retry_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = dict()
+        # when each key whose refresh failed can be refreshed again
+        self._retry_at: Dict[Hashable, float] = dict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "waits": 0}
+        # how often each key is asked for, to pick which ones to keep warm
+        self.requests: Counter = Counter()
+        self._requests_since_decay = 0
+
+    def _call(self, key: Tuple, future: Future) -> None:
+        try:
+            value = self.func(*key)
+        except BaseException as err:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(err)
+            return
+        entry = CacheEntry(value, self.clock())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._retry_at.pop(evicted_key, None)
+            self._retry_at.pop(key, None)
+            self._inflight.pop(key, None)
+        future.set_result(entry)
+
+    def _count_request(self, key: Tuple) -> None:
+        # called with the lock held
+        self.requests[key] += 1
+        self._requests_since_decay += 1
+        if self._requests_since_decay >= self.decay_every:
+            self._requests_since_decay = 0
+            for counted_key, count in list(self.requests.items()):
+                if count // 2:
+                    self.requests[counted_key] = count // 2
+                else:
+                    del self.requests[counted_key]
+
+    def _refresh(self, key: Tuple, future: Future) -> None:
+        self._call(key, future)
+        if future.exception() is not None:
+            with self._lock:
+                self._retry_at[key] = self.clock() + self.retry_seconds
+            logging.warning(
+                f"Could not refresh {self.func.__name__}{key}, still serving the "
+                f"stale value for {self.retry_seconds}s: {future.exception()}"
+            )
+
+    def _wait(self, key: Tuple, future: Future) -> CacheEntry:
+        try:
+            return future.result(timeout=self.wait_timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                # the next caller makes its own call instead of waiting on this one
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            raise TimeoutError(f"Timed out waiting on {self.func.__name__}{key}!")
+
+    def get(self, *args) -> Any:
+        return _copy(self.get_entry(*args).value)
+
+    def get_entry(self, *args) -> CacheEntry:
+        """
+        Gets the cached entry like `get`, but the value isn't copied, so it's
+        shared and must be copied before modifying it. The entry's `fetched_at`
+        changes with every fetch, so it can key anything derived from the value.
+        """
+        key = args
+        with self._lock:
+            self._count_request(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            age = self.clock() - entry.fetched_at if entry is not None else None
+            if age is not None and age <= self.ttl:
+                self.stats["hits"] += 1
+                return entry
+            future = self._inflight.get(key)
+            if age is not None and age <= self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                if future is None and self.clock() >= self._retry_at.get(key, 0.0):
+                    future = Future()
+                    self._inflight[key] = future
+                    _refresh_executor.submit(self._refresh, key, future)
+                return entry
+            is_owner = future is None
+            if is_owner:
+                self.stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats["waits"] += 1
+        if is_owner:
+            self._call(key, future)
+        return self._wait(key, future)
+
+    def refresh(self, *args) -> Any:
+        """
+        Calls the function now and stores the result, without counting it as a
+        request. Joins the call already in flight for the key if there is one.
+        """
+        key = args
+        with self._lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+        if is_owner:
+            self._call(key, future)
+        return _copy(self._wait(key, future).value)
+
+    def get_age(self, *args) -> Optional[float]:
+        """Gets the seconds since the key was fetched, or None if it's not cached."""
+        with self._lock:
+            entry = self._entries.get(args)
+            return self.clock() - entry.fetched_at if entry is not None else None
+
+    def most_requested(self, num_keys: int) -> List[Tuple]:
+        """Gets the `num_keys` most requested keys, most requested first."""
+        with self._lock:
+            return [key for key, _ in self.requests.most_common(num_keys)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy(value: Any) -> Any:
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+def swr_cache(ttl: float, stale_ttl: Optional[float] = None) -> Callable:
+    """
+    Decorates a function with an `SWRCache`. Entries are served stale for
+    another `ttl` seconds by default. The function gets `clear()` and `cache`
+    attributes.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = SWRCache(func, ttl, ttl if stale_ttl is None else stale_ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return cache.get(*args)
+
+        wrapper.clear = cache.clear  # type: ignore
+        wrapper.cache = cache  # type: ignore
+        return wrapper
+
+    return decorator
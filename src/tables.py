@@ -0,0 +1,166 @@
+"""
+Pulls HTML tables out of scraped pages. Instead of building a full soup, the
+page is streamed through the standard library's HTML parser and only the cell
+text of the requested tables is kept, stopping as soon as the last of them
+closes.
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+
+
+class _DoneParsing(Exception):
+    pass
+
+
+class _TableParser(HTMLParser):
+    """
+    Collects the header and body rows of the requested tables. Tables are
+    counted in document order, like BeautifulSoup's find_all("table"), but
+    only within the first `container` tag if one is given.
+    """
+
+    def __init__(self, indices: Iterable[int], container: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.indices = set(indices)
+        self.last_index = max(self.indices)
+        self.container = container
+        self.container_depth = 0 if container else 1
+        self.container_done = False
+        self.num_tables = 0
+        # index of each open table, or None if it's not one of the requested
+        self.open_tables: List[Optional[int]] = list()
+        self.headers: Dict[int, List[str]] = dict()
+        self.rows: Dict[int, List[List[str]]] = dict()
+        self.section: Optional[str] = None
+        self.row: Optional[List[str]] = None
+        self.cell: Optional[List[str]] = None
+
+    @property
+    def current_table(self) -> Optional[int]:
+        return self.open_tables[-1] if self.open_tables else None
+
+    def _end_cell(self) -> None:
+        if self.cell is not None and self.row is not None:
+            self.row.append("".join(self.cell).strip())
+        self.cell = None
+
+    def _end_row(self) -> None:
+        self._end_cell()
+        if self.row is not None:
+            if self.section == "thead":
+                # only the first header row, like thead.find("tr")
+                self.headers.setdefault(self.current_table, self.row)
+            else:
+                self.rows[self.current_table].append(self.row)
+        self.row = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == self.container and not self.container_done:
+            self.container_depth += 1
+            return
+        if not self.container_depth:
+            return
+        if tag == "table":
+            index = self.num_tables if self.num_tables in self.indices else None
+            self.num_tables += 1
+            self.open_tables.append(index)
+            if index is not None:
+                self.rows[index] = list()
+        elif self.current_table is None:
+            return
+        elif tag in ("thead", "tbody"):
+            self.section = tag
+        elif tag == "tr" and self.section is not None:
+            # an unclosed row ends where the next one starts
+            self._end_row()
+            self.row = list()
+        elif self.row is not None and tag in ("th", "td"):
+            self._end_cell()
+            # header rows keep th cells and body rows keep td cells
+            if (tag == "th") == (self.section == "thead"):
+                self.cell = list()
+
+    def handle_endtag(self, tag):
+        if tag == self.container and self.container_depth:
+            self.container_depth -= 1
+            self.container_done = not self.container_depth
+            return
+        if not self.container_depth:
+            return
+        if tag == "table" and self.open_tables:
+            if self.current_table is not None:
+                self._end_row()
+            index = self.open_tables.pop()
+            self.section = None
+            if index == self.last_index:
+                raise _DoneParsing
+        elif self.current_table is None:
+            return
+        elif tag in ("thead", "tbody"):
+            self._end_row()
+            self.section = None
+        elif tag in ("th", "td"):
+            self._end_cell()
+        elif tag == "tr":
+            self._end_row()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def extract_tables(
+    html: Union[str, bytes],
+    indices: Sequence[int],
+    container: Optional[str] = None,
+    lowercase_headers: bool = False,
+) -> List[pd.DataFrame]:
+    """
+    Extracts the tables at `indices` from the page, counting only the tables
+    inside the first `container` tag if it's given. Each table's columns come
+    from the first row of its thead and its rows from the td cells of its
+    tbody. All values are left as strings; see `convert_numeric_columns`.
+    Raises an IndexError if the page has fewer tables than requested.
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    parser = _TableParser(indices, container)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _DoneParsing:
+        pass
+    missing = [index for index in indices if index not in parser.rows]
+    if missing:
+        raise IndexError(
+            f"Only found {parser.num_tables} tables, wanted table {missing[0]}!"
+        )
+
+    tables = list()
+    for index in indices:
+        headers = parser.headers.get(index)
+        if headers is not None and lowercase_headers:
+            headers = [header.lower() for header in headers]
+        tables.append(pd.DataFrame(parser.rows[index], columns=headers))
+    return tables
+
+
+def extract_table(
+    html: Union[str, bytes],
+    index: int = 0,
+    container: Optional[str] = None,
+    lowercase_headers: bool = False,
+) -> pd.DataFrame:
+    """Extracts a single table from the page. See `extract_tables`."""
+    return extract_tables(html, [index], container, lowercase_headers)[0]
+
+
+def convert_numeric_columns(
+    df: pd.DataFrame, exclude: Sequence[str] = ("team",)
+) -> pd.DataFrame:
+    """Converts every column but the excluded ones to floats in one pass."""
+    numeric_cols = [col for col in df.columns if col not in exclude]
+    return df.astype({col: float for col in numeric_cols})
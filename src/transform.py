@@ -1,13 +1,35 @@
+import json
+import logging
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
 import pandas as pd
-import streamlit as st
 
 import darko
 import drip
 # from hashtag_rookies import get_hashtag_rookie_per_game_stats
-from calc_stats import (calc_categories_value, calc_fantasy_pts,
-                        calc_per_game_projections, calc_player_values)
+from artifacts import load_artifact, save_artifact
+from calc_stats import (calc_all_fantasy_pts, calc_all_per_game_projections,
+                        calc_categories_value, calc_per_game_projections,
+                        calc_player_values, calc_points_above_replacement,
+                        get_replacement_values, get_sgp_values,
+                        per_game_stat_sources)
+from ingest import fetch_sources
 from utils import (get_hashtag_rookie_projections, get_hashtag_ros_projections,
                    get_name_map, get_ottoneu_leaderboard)
+from ytd_totals import get_incremental_leaderboard
+
+# bits for encoding position eligibility, e.g. a G/F is 1 | 2 = 3
+position_bits = {"G": 1, "F": 2, "C": 4}
+# positions each roster slot accepts, with 0 meaning any player. the F/C and G/F
+# slots have only ever taken forwards when finding the draftable players, so they
+# stay that way until the values are meant to change
+draft_slot_bits = {"C": 4, "F": 2, "G": 1, "F/C": 2, "G/F": 2, "UTIL": 0}
+# column suffix for each horizon in the multi-horizon values
+horizon_suffixes = {"current": "", "rest_of_season": "_ros", "year_to_date": "_ytd"}
+valuation_scoring_types = ["simple_points", "trad_points", "categories"]
+# the columns behind a player's production and draft eligibility
+valuation_input_cols = ["ottoneu_position"] + list(per_game_stat_sources)
 
 
 def combine_darko_drip_df(
@@ -75,47 +97,92 @@ def combine_darko_drip_df(
     return combined_df[keep_cols].rename(columns={"name": "player"})
 
 
+def get_position_eligibility(positions: pd.Series) -> np.ndarray:
+    """
+    Encodes each player's position eligibility as a bitmask (G = 1, F = 2, C = 4),
+    parsing each distinct position string once. Missing positions are encoded as 0.
+    """
+    codes, uniques = pd.factorize(positions)
+    unique_masks = np.array(
+        [
+            sum(bit for pos, bit in position_bits.items() if pos in position)
+            for position in uniques
+        ]
+        + [0],
+        dtype=np.uint8,
+    )
+    # factorize marks missing values with -1, which picks up the trailing 0
+    return unique_masks[codes]
+
+
+def rank_eligible(values: np.ndarray, is_eligible: np.ndarray) -> np.ndarray:
+    """
+    Ranks the eligible values in descending order, with ties sharing their
+    average rank and missing values at the bottom, to match pandas'
+    rank(ascending=False, na_option="bottom"). Ineligible rows are ranked inf.
+    """
+    # negate so an ascending sort is a descending ranking, NaNs go last as inf
+    sort_keys = np.where(np.isnan(values), np.inf, -values)
+    eligible_keys = np.sort(sort_keys[is_eligible])
+    lower = np.searchsorted(eligible_keys, sort_keys, side="left")
+    upper = np.searchsorted(eligible_keys, sort_keys, side="right")
+    return np.where(is_eligible, (lower + 1 + upper) / 2, np.inf)
+
+
 def find_surplus_positions(fantasy_df: pd.DataFrame, scoring_type: str) -> pd.Series:
     """
     Assigns the position each player will be considered for the value calculations
     according to where they are eligible and their ranked production.
     """
     # Need to figure out the full strength thing here - 1/11/21
-    fantasy_df["is_center"] = fantasy_df.ottoneu_position.str.contains("C").map(
-        {False: None, True: True}
-    )
-    fantasy_df["is_forward"] = fantasy_df.ottoneu_position.str.contains("F").map(
-        {False: None, True: True}
-    )
-    fantasy_df["is_guard"] = fantasy_df.ottoneu_position.str.contains("G").map(
-        {False: None, True: True}
-    )
-    fantasy_df["center_rk"] = fantasy_df.groupby("is_center")[scoring_type].rank(
-        ascending=False, na_option="bottom"
-    )
-    fantasy_df["forward_rk"] = fantasy_df.groupby("is_forward")[scoring_type].rank(
-        ascending=False, na_option="bottom"
-    )
-    fantasy_df["guard_rk"] = fantasy_df.groupby("is_guard")[scoring_type].rank(
-        ascending=False, na_option="bottom"
-    )
-    fantasy_df["center_rk"] = fantasy_df.apply(
-        lambda row: row.center_rk if row.is_center else None, axis="columns"
-    )
-    fantasy_df["forward_rk"] = fantasy_df.apply(
-        lambda row: row.forward_rk if row.is_forward else None, axis="columns"
-    )
-    fantasy_df["guard_rk"] = fantasy_df.apply(
-        lambda row: row.guard_rk if row.is_guard else None, axis="columns"
+    eligibility = get_position_eligibility(fantasy_df.ottoneu_position)
+    values = fantasy_df[scoring_type].to_numpy(dtype=float)
+    # ordered C, F, G so ties in rank go to the earlier position
+    surplus_positions = ["C", "F", "G"]
+    position_ranks = np.column_stack(
+        [
+            rank_eligible(values, (eligibility & position_bits[pos]) > 0)
+            for pos in surplus_positions
+        ]
     )
     # should I worry about ties? 1/11/21
-    return (
-        fantasy_df[["center_rk", "forward_rk", "guard_rk"]]
-        .idxmin(axis="columns")
-        .map({"center_rk": "C", "forward_rk": "F", "guard_rk": "G"})
+    best_position = np.array(surplus_positions, dtype=object)[
+        position_ranks.argmin(axis=1)
+    ]
+    return pd.Series(
+        np.where(eligibility > 0, best_position, np.nan),
+        index=fantasy_df.index,
+        dtype=object,
     )
 
 
+def allocate_draft_slots(
+    eligibility: np.ndarray, values: np.ndarray, slot_quotas: Dict[str, int]
+) -> np.ndarray:
+    """
+    Walks the players from most to least valuable a single time, placing each one
+    in the first slot group (in the order of `slot_quotas`) that they are eligible
+    for and that still has room. Returns each player's slot group index, or -1 for
+    players left undrafted.
+    """
+    slot_bits = [draft_slot_bits[slot] for slot in slot_quotas]
+    remaining = list(slot_quotas.values())
+    slots = np.full(len(values), -1)
+    open_spots = sum(remaining)
+    # stable sort so ties keep their original order, NaNs sort to the end
+    for idx in np.argsort(-values, kind="stable"):
+        if open_spots <= 0:
+            break
+        player_bits = eligibility[idx]
+        for slot_idx, bits in enumerate(slot_bits):
+            if remaining[slot_idx] > 0 and (bits == 0 or player_bits & bits):
+                slots[idx] = slot_idx
+                remaining[slot_idx] -= 1
+                open_spots -= 1
+                break
+    return slots
+
+
 def get_draftable_players(
     fantasy_df: pd.DataFrame,
     scoring_type: str,
@@ -125,80 +192,70 @@ def get_draftable_players(
     num_f_c: int = 12,
     num_g_f: int = 12,
     num_util: int = 36,
-) -> list:
+    return_slots: bool = False,
+) -> Union[list, pd.Series]:
     """
     Finds the draftable players for each position group, moving from centers down
     the positional spectrum to guards and repeating for the combined positions.
     Once a player is deemed 'draftable' at a position, then he is removed from
     the pool for future positions.
+
+    Returns the players grouped by slot and ordered by value within each slot, or
+    a series of the slot each player filled, indexed by nba_player_id, if
+    `return_slots` is True.
     """
     # Need to figure out the full strength thing here - 1/11/21
-    draftable_players: list = list()
-    draftable_players.extend(
-        fantasy_df.loc[
-            (fantasy_df.is_center) & (~fantasy_df.nba_player_id.isin(draftable_players))
-        ]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_centers)
-        .tolist()
-    )
-    draftable_players.extend(
-        fantasy_df.loc[
-            (fantasy_df.is_forward)
-            & (~fantasy_df.nba_player_id.isin(draftable_players))
-        ]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_forwards)
-        .tolist()
-    )
-    draftable_players.extend(
-        fantasy_df.loc[
-            (fantasy_df.is_guard) & (~fantasy_df.nba_player_id.isin(draftable_players))
-        ]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_guards)
-        .tolist()
+    slot_quotas = {
+        "C": num_centers,
+        "F": num_forwards,
+        "G": num_guards,
+        "F/C": num_f_c,
+        "G/F": num_g_f,
+        "UTIL": num_util,
+    }
+    values = fantasy_df[scoring_type].to_numpy(dtype=float)
+    slots = allocate_draft_slots(
+        get_position_eligibility(fantasy_df.ottoneu_position), values, slot_quotas
     )
-    draftable_players.extend(
-        fantasy_df.loc[
-            ((fantasy_df.is_forward) | (fantasy_df.is_center))
-            & (~fantasy_df.nba_player_id.isin(draftable_players))
-        ]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_f_c)
-        .tolist()
-    )
-    draftable_players.extend(
-        fantasy_df.loc[
-            ((fantasy_df.is_forward) | (fantasy_df.is_guard))
-            & (~fantasy_df.nba_player_id.isin(draftable_players))
-        ]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_g_f)
-        .tolist()
-    )
-    draftable_players.extend(
-        fantasy_df.loc[~fantasy_df.nba_player_id.isin(draftable_players)]
-        .sort_values(by=scoring_type, ascending=False)
-        .nba_player_id.head(num_util)
-        .tolist()
-    )
-
-    return draftable_players
+    # group by slot while keeping the value order within each slot
+    drafted = np.flatnonzero(slots >= 0)
+    drafted = drafted[np.lexsort((-values[drafted], slots[drafted]))]
+    player_ids = fantasy_df.nba_player_id.to_numpy()[drafted]
 
+    if return_slots:
+        return pd.Series(
+            np.array(list(slot_quotas), dtype=object)[slots[drafted]],
+            index=pd.Index(player_ids, name="nba_player_id"),
+            name="draft_slot",
+        )
+    return player_ids.tolist()
 
-def prep_stats_df() -> pd.DataFrame:
-    """Prepares the statistics by pulling and merging all of the relevant data."""
-    drip_df = drip.get_current_drip()
-    drip_df = drip.transform_drip(drip_df)
-
-    darko_df = darko.get_current_darko()
-    darko_df = darko.transform_darko(darko_df)
-
-    name_map = get_name_map()
 
-    hashtag_minutes = get_hashtag_ros_projections()
-    leaderboards = get_ottoneu_leaderboard()
+def prep_stats_df(incremental_ytd: bool = False) -> pd.DataFrame:
+    """
+    Prepares the statistics by pulling and merging all of the relevant data.
+    With `incremental_ytd`, the year to date totals come from the locally stored
+    totals plus only the games since the last run.
+    """
+    # the sources are independent, so pull them all at once
+    sources, _ = fetch_sources(
+        {
+            "drip": drip.get_transformed_drip,
+            "darko": darko.get_transformed_darko,
+            "name_map": get_name_map,
+            "hashtag_minutes": get_hashtag_ros_projections,
+            "leaderboards": (
+                get_incremental_leaderboard
+                if incremental_ytd
+                else get_ottoneu_leaderboard
+            ),
+        }
+    )
+    drip_df = sources["drip"]
+    darko_df = sources["darko"]
+    name_map = sources["name_map"]
+    hashtag_minutes = sources["hashtag_minutes"]
+    leaderboards = sources["leaderboards"]
 
     stats_df = combine_darko_drip_df(darko_df, drip_df, name_map)
     stats_df = stats_df.loc[stats_df.nba_player_id.notna()].copy()
@@ -216,30 +273,75 @@ def prep_stats_df() -> pd.DataFrame:
     return stats_df
 
 
-@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
 def get_scoring_minutes_combo(
     projection_type: str, stats_df: pd.DataFrame, is_rollup: bool = True
 ) -> pd.DataFrame:
     """
     Finds the per game projections and player values for each scoring type based
-    on the projection type, performing all of the intermediate steps.
+    on the projection type, performing all of the intermediate steps. The pages
+    get these through `valuation_cache.get_snapshot_values`, which caches them
+    by the stats snapshot's version.
     """
-    scoring_types = ["simple_points", "trad_points", "categories"]
-    # added .copy() method to maybe help with the StCachedObjectMutation warning
-    # note: need to actually test that
-    df = calc_per_game_projections(stats_df.copy(), projection_type=projection_type)
+    # calc_per_game_projections builds a new frame and leaves stats_df untouched
+    df = calc_per_game_projections(stats_df, projection_type=projection_type)
+    return calc_projection_values(df, projection_type, is_rollup=is_rollup)
 
+
+def get_multi_horizon_values(
+    stats_df: pd.DataFrame, id_cols: List[str], incremental: bool = False
+) -> pd.DataFrame:
+    """
+    Finds the player values for the current, rest of season, and year to date
+    projections in one pass, lining the horizons up side by side on the shared
+    player rows. The `id_cols` appear once, while the rest of the columns get
+    the horizon's suffix from `horizon_suffixes`. With `incremental`, each
+    horizon only revalues what changed since the last run's stored state.
+    """
+    projections = calc_all_per_game_projections(stats_df, list(horizon_suffixes))
+    horizon_frames = [stats_df[id_cols]]
+    for projection_type, suffix in horizon_suffixes.items():
+        if incremental:
+            state_name = f"valuation_state_{projection_type}"
+            try:
+                previous_state = load_artifact(state_name)
+            except FileNotFoundError:
+                previous_state = None
+            values_df, state = calc_projection_values_incremental(
+                projections[projection_type], projection_type, previous_state
+            )
+            save_artifact(state, state_name)
+        else:
+            values_df = calc_projection_values(
+                projections[projection_type], projection_type
+            )
+        horizon_frames.append(values_df.drop(columns=id_cols).add_suffix(suffix))
+    return pd.concat(horizon_frames, axis=1)
+
+
+def fill_rookie_projections(df: pd.DataFrame) -> pd.DataFrame:
+    """Fills in the hashtagbasketball projections for the rookies."""
+    hashtag_rookies = get_hashtag_rookie_projections().set_index("pid")
+    hashtag_rookies["fg_pct"] = hashtag_rookies.fgm_game / hashtag_rookies.fga_game
+    hashtag_rookies["fg3_pct"] = hashtag_rookies.fg3m_game / hashtag_rookies.fg3a_game
+    temp_df = df.set_index("hashtag_id")
+    temp_df.update(hashtag_rookies)
+    # keep the original index so the horizons still line up
+    return temp_df.reset_index().set_axis(df.index, axis="index")
+
+
+def calc_projection_values(
+    df: pd.DataFrame, projection_type: str, is_rollup: bool = True
+) -> pd.DataFrame:
+    """
+    Finds the player values for each scoring type from the per game projections,
+    filling in the rookie projections for the rest of season.
+    """
     if projection_type == "rest_of_season":
-        hashtag_rookies = get_hashtag_rookie_projections().set_index("pid")
-        hashtag_rookies["fg_pct"] = hashtag_rookies.fgm_game / hashtag_rookies.fga_game
-        hashtag_rookies["fg3_pct"] = (
-            hashtag_rookies.fg3m_game / hashtag_rookies.fg3a_game
-        )
-        temp_df = df.set_index("hashtag_id")
-        temp_df.update(hashtag_rookies)
-        df = temp_df.reset_index()
+        df = fill_rookie_projections(df)
 
-    for scoring_type in scoring_types:
+    # all of the points systems come out of one pass over the stats
+    fantasy_pts = calc_all_fantasy_pts(df)
+    for scoring_type in valuation_scoring_types:
         if scoring_type == "categories":
             if not is_rollup:
                 df = calc_categories_value(df, is_rollup).rename(
@@ -248,10 +350,7 @@ def get_scoring_minutes_combo(
             else:
                 df[f"{scoring_type}"] = calc_categories_value(df, is_rollup)
         else:
-            simple_scoring = True if scoring_type == "simple_points" else False
-            df[f"{scoring_type}"] = calc_fantasy_pts(
-                df, is_simple_scoring=simple_scoring
-            )
+            df[f"{scoring_type}"] = fantasy_pts[scoring_type]
         df[f"{scoring_type}_position"] = find_surplus_positions(
             df, scoring_type=scoring_type
         )
@@ -263,6 +362,137 @@ def get_scoring_minutes_combo(
     return df
 
 
+def find_changed_rows(new_df: pd.DataFrame, old_df: pd.DataFrame) -> np.ndarray:
+    """
+    Compares two frames with the same columns row by row, treating missing
+    values as equal. Returns a mask of the rows that differ.
+    """
+    old_df = old_df.set_axis(new_df.index, axis="index")
+    same = new_df.eq(old_df) | (new_df.isna() & old_df.isna())
+    return ~same.all(axis=1).to_numpy()
+
+
+def calc_projection_values_incremental(
+    df: pd.DataFrame,
+    projection_type: str,
+    previous_state: Union[pd.DataFrame, None] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Finds the same values as `calc_projection_values`, reusing what it can from
+    the previous run's state. Only the players whose inputs changed get their
+    production recalculated. For each scoring type, the replacement levels and
+    surplus factor are only redone when the draft pool or the replacement levels
+    move, or a player in the pool changed. Without a usable previous state,
+    everything is calculated from scratch.
+
+    Returns the values and the state to pass in on the next run.
+    """
+    if projection_type == "rest_of_season":
+        df = fill_rookie_projections(df)
+    player_ids = df.nba_player_id
+    state_cols = {"sgp_key", "points_above_repl"} | {
+        f"{scoring_type}_{suffix}"
+        for scoring_type in valuation_scoring_types
+        for suffix in ["position", "value", "draftable"]
+    }
+    sgp_key = json.dumps(get_sgp_values(), sort_keys=True)
+    # the previous run has to line up player by player
+    has_previous = (
+        previous_state is not None
+        and set(previous_state.columns) >= set(df.columns) | state_cols
+        and player_ids.notna().all()
+        and not player_ids.duplicated().any()
+    )
+    if has_previous:
+        previous = previous_state.set_index("nba_player_id").reindex(player_ids)
+        is_new = ~player_ids.isin(previous_state.nba_player_id).to_numpy()
+        has_same_players = not is_new.any() and len(previous_state) == len(df)
+        changed = is_new | find_changed_rows(
+            df[valuation_input_cols], previous[valuation_input_cols]
+        )
+        is_sgp_changed = previous_state.sgp_key.iloc[0] != sgp_key
+    else:
+        has_same_players = False
+        changed = np.ones(len(df), dtype=bool)
+        is_sgp_changed = True
+    logging.info(f"{changed.sum()} of {len(df)} players changed for {projection_type}")
+
+    # all of the points systems come out of one pass over the changed players
+    fantasy_pts = calc_all_fantasy_pts(df.loc[changed])
+    for scoring_type in valuation_scoring_types:
+        is_dirty = changed
+        if scoring_type == "categories":
+            is_dirty = changed | is_sgp_changed
+            dirty_production = calc_categories_value(df.loc[is_dirty], is_rollup=True)
+        else:
+            dirty_production = fantasy_pts[scoring_type]
+        production = (
+            previous[scoring_type].to_numpy(dtype=float)
+            if has_previous
+            else np.full(len(df), np.nan)
+        )
+        production[is_dirty] = dirty_production.to_numpy(dtype=float)
+        df[scoring_type] = production
+
+        if has_same_players and not is_dirty.any():
+            # nothing moved, so neither did the draft pool or the values
+            for col in [
+                f"{scoring_type}_position",
+                "points_above_repl",
+                f"{scoring_type}_value",
+                f"{scoring_type}_draftable",
+            ]:
+                df[col] = previous[col].to_numpy()
+            continue
+
+        df[f"{scoring_type}_position"] = find_surplus_positions(
+            df, scoring_type=scoring_type
+        )
+        draftable_players = get_draftable_players(df, scoring_type=scoring_type)
+        is_draftable = player_ids.isin(draftable_players).to_numpy()
+        can_reuse_values = (
+            has_same_players
+            and not (is_dirty & is_draftable).any()
+            and np.array_equal(
+                is_draftable, previous[f"{scoring_type}_draftable"].to_numpy()
+            )
+            and not find_changed_rows(
+                df[[f"{scoring_type}_position"]],
+                previous[[f"{scoring_type}_position"]],
+            ).any()
+        )
+        if can_reuse_values:
+            replacement_values = get_replacement_values(
+                df, scoring_type, draftable_players
+            )
+            previous_replacement_values = get_replacement_values(
+                previous_state,
+                scoring_type,
+                previous_state.nba_player_id[
+                    previous_state[f"{scoring_type}_draftable"]
+                ].tolist(),
+            )
+            can_reuse_values = replacement_values == previous_replacement_values
+        if can_reuse_values:
+            # only players outside of the pool changed, and they're worth $0
+            # either way, so the surplus factor and everyone's value stand
+            df["points_above_repl"] = calc_points_above_replacement(
+                df, scoring_type, replacement_values
+            )
+            df[f"{scoring_type}_value"] = previous[f"{scoring_type}_value"].to_numpy()
+        else:
+            df[f"{scoring_type}_value"] = calc_player_values(
+                df, scoring_type=scoring_type, draftable_players=draftable_players
+            )
+        df[f"{scoring_type}_draftable"] = is_draftable
+
+    state = df.assign(sgp_key=sgp_key)
+    return (
+        df.drop(columns=[f"{col}_draftable" for col in valuation_scoring_types]),
+        state,
+    )
+
+
 def get_roster_depth(
     league_data: pd.DataFrame,
     league_scoring: str,
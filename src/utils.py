@@ -1,14 +1,26 @@
 import json
 import logging
 import time
+from datetime import datetime
 from random import uniform
-from typing import Optional
+from typing import Dict, List, Optional
 
 import gspread  # type: ignore
 import pandas as pd
+import streamlit as st
+
+from artifacts import (get_latest_version, load_artifact, save_artifact,
+                       version_to_datetime)
+from mapping_index import get_mapping_index
+from source_cache import get_source_frame
 
 logging.basicConfig(level=logging.INFO)
 
+SGP_ROLLUP_SNAPSHOT = "./data/sgp_rollup_snapshot.csv"
+VALUES_SHEET_KEY = "1GgwZpflcyoRYMP0yL2hrbNwndJjVFm34x3jXnUooSfA"
+VALUES_ARTIFACT = "all_values"
+LEAGUES_SHEET_KEY = "14TkjXjFSWDQsHZy6Qt77elLnVpi1HwrpbqzVC4JKDjc"
+
 
 def _setup_gdrive(client_key_string: Optional[str]) -> gspread.client.Client:
     credentials = json.loads(client_key_string)  # type: ignore
@@ -41,43 +53,154 @@ def get_existing_sgp_data() -> pd.DataFrame:
     )
 
 
-def get_sgp_rollup() -> pd.DataFrame:
+@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
+def _pull_sgp_rollup() -> pd.DataFrame:
+    """
+    Pulls the SGP league averages by season from the Google sheet and saves them
+    to the local snapshot. Only successful pulls are cached.
+    """
     gid = "56814419"
     sheet_key = "17NoW7CT-AvQ9-VtT22nzaXnVCYNgunGDlYeDeDEn_Mc"
-    return pd.read_csv(
+    sgp_rollup = pd.read_csv(
         f"https://docs.google.com/spreadsheets/d/{sheet_key}/gviz/tq?tqx=out:csv&gid={gid}"
     )
+    try:
+        sgp_rollup.to_csv(SGP_ROLLUP_SNAPSHOT, index=False)
+    except OSError:
+        logging.info("Could not save the SGP rollup snapshot!")
+    return sgp_rollup
 
 
+def get_sgp_rollup() -> pd.DataFrame:
+    """
+    Gets the SGP league averages by season from the Google sheet, cached for the
+    process. Every successful pull is saved to a local snapshot, which is used
+    instead when the sheet can't be reached or read. The snapshot isn't cached,
+    so the sheet is tried again on the next call. Use `get_sgp_rollup.clear()`
+    to force a fresh pull.
+    """
+    try:
+        return _pull_sgp_rollup()
+    # OSError covers URLError, HTTPError and timeouts, ValueError covers bad CSVs
+    except (OSError, ValueError) as err:
+        logging.warning(
+            f"Could not pull the SGP rollup, using snapshot {SGP_ROLLUP_SNAPSHOT}: {err}"
+        )
+        return pd.read_csv(SGP_ROLLUP_SNAPSHOT)
+
+
+get_sgp_rollup.clear = _pull_sgp_rollup.clear  # type: ignore
+
+
+@st.cache_data(ttl=10 * 60)  # type: ignore
+def get_published_run_date() -> datetime:
+    """
+    Gets when the values in the Google sheet were published by the pipeline,
+    checked at most every ten minutes.
+    """
+    sheet_url = f"https://docs.google.com/spreadsheets/d/{VALUES_SHEET_KEY}/export?format=csv"
+    run_date = pd.read_csv(f"{sheet_url}&gid=1905916816").values[0][0]
+    return datetime.strptime(run_date, "%Y-%m-%d %H:%M:%S")
+
+
+def get_values_df(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Gets the player values from the latest pipeline run in the local artifact
+    store. The values are only pulled from the Google sheet, and saved locally,
+    when the sheet has a newer run than the local one. The local run is used if
+    the sheet can't be reached.
+    """
+    version = get_latest_version(VALUES_ARTIFACT)
+    values_df = None
+    try:
+        run_date = get_published_run_date()
+        if version is None or run_date > version_to_datetime(version):
+            sheet_url = f"https://docs.google.com/spreadsheets/d/{VALUES_SHEET_KEY}/export?format=csv"
+            values_df = pd.read_csv(f"{sheet_url}&gid=0")
+    # OSError covers URLError, HTTPError and timeouts, ValueError covers bad CSVs
+    except (OSError, ValueError) as err:
+        if version is None:
+            raise
+        logging.warning(f"Could not pull the values, using version {version}: {err}")
+    if values_df is not None:
+        try:
+            version = save_artifact(values_df, VALUES_ARTIFACT, run_time=run_date)
+        except OSError:
+            logging.info("Could not save the values locally!")
+            return values_df if columns is None else values_df[columns]
+    return load_artifact(VALUES_ARTIFACT, version, columns=columns)
+
+
+def get_values_run_date() -> str:
+    """Gets the run date of the latest values in the local artifact store."""
+    version = get_latest_version(VALUES_ARTIFACT)
+    if version is None:
+        return "Unknown"
+    return version_to_datetime(version).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
 def get_leagues_metadata() -> pd.DataFrame:
-    sheet_key = "14TkjXjFSWDQsHZy6Qt77elLnVpi1HwrpbqzVC4JKDjc"
+    """Gets the settings of every league from the league info sheet."""
     return pd.read_csv(
-        f"https://docs.google.com/spreadsheets/d/{sheet_key}/export?format=csv&gid=0"
+        f"https://docs.google.com/spreadsheets/d/{LEAGUES_SHEET_KEY}/export?format=csv&gid=0"
     )
 
 
+@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
+def get_leagues_metadata_index() -> Dict[int, dict]:
+    """Gets the settings of every league, keyed by league ID."""
+    leagues_metadata = get_leagues_metadata()
+    return leagues_metadata.set_index("league_id").to_dict(orient="index")
+
+
+def get_league_metadata(league_id: int) -> dict:
+    """Gets the settings of a single league."""
+    try:
+        return get_leagues_metadata_index()[int(league_id)]
+    except KeyError:
+        raise ValueError(f"League {league_id} is not in the league info sheet!")
+
+
 def get_name_map() -> pd.DataFrame:
-    """Gets the mapping for names and IDs."""
-    return pd.read_csv("./data/mappings_update_2023-09-14.csv")
+    """
+    Gets the mapping for names and IDs. For looking up one ID from another,
+    use `get_mapping_index` instead of merging on this.
+    """
+    return get_mapping_index().mappings.copy()
+
+
+@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
+def get_hashtag_projections() -> pd.DataFrame:
+    """
+    Gets the full hashtagbasketball projections sheet. Both the ROS minutes and
+    the rookie projections are served from this one download.
+    """
+    sheet_id = "1RiXnGk2OFnGRmW9QNQ_1CFde0xfSZpyC9Cn3OLLojsY"  # env variable?
+    return get_source_frame(
+        "hashtag",
+        f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0",
+        pd.read_csv,
+    )
+
+
+@st.cache_data(ttl=12 * 60 * 60)  # type: ignore
+def get_rookies() -> pd.DataFrame:
+    """Gets the rookies mapping, indexed by their hashtagbasketball ID."""
+    rookies = pd.read_csv("data/rookies.csv").dropna(subset=["hashtag_id"])
+    return rookies.set_index(rookies.hashtag_id.astype(int))
 
 
 def get_hashtag_ros_projections() -> pd.DataFrame:
     """Gets the hashtagbasketball projections from the Google sheet."""
-    sheet_id = "1RiXnGk2OFnGRmW9QNQ_1CFde0xfSZpyC9Cn3OLLojsY"  # env variable?
-    df = pd.read_csv(
-        f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-    )
-    return df[["name", "pid", "games_forecast", "minutes_forecast"]]
+    return get_hashtag_projections()[
+        ["name", "pid", "games_forecast", "minutes_forecast"]
+    ]
 
 
 def get_hashtag_rookie_projections() -> pd.DataFrame:
-    sheet_id = "1RiXnGk2OFnGRmW9QNQ_1CFde0xfSZpyC9Cn3OLLojsY"  # env variable?
-    df = pd.read_csv(
-        f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-    )
-    rookies = pd.read_csv("data/rookies.csv")
-    hashtag_rookies = [int(pid) for pid in rookies.hashtag_id.dropna().tolist()]
-    return df.loc[df.pid.isin(hashtag_rookies)]
+    df = get_hashtag_projections()
+    return df.loc[df.pid.isin(get_rookies().index)]
 
 
 def get_ottoneu_leaderboard() -> pd.DataFrame:
@@ -0,0 +1,108 @@
+"""
+Caches the player valuations for the pages, keyed by the stats snapshot's
+version, the projection type and whether the categories are rolled up. Unlike
+`st.cache_data`, nothing is hashed or pickled on a hit: the key is a few short
+strings and the cached frame itself is handed back, shared by every session.
+Callers must copy a result before modifying it.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from stats_snapshot import get_stats_snapshot
+from transform import get_scoring_minutes_combo
+
+logging.basicConfig(level=logging.INFO)
+
+
+class ValuationCache:
+    """
+    A thread safe LRU cache of up to `max_entries` frames. Concurrent misses on
+    the same key wait for a single computation instead of repeating it.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Gets the frame for the key, calling `compute` to fill in a miss."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another caller may have filled it in while this one waited
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+            value = compute()
+            with self._lock:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._key_locks.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Gets the hit and miss counts, the hit rate and the number of entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logging.info(
+            f"Valuation cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['entries']} entries"
+        )
+
+
+_cache: Optional[ValuationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_valuation_cache() -> ValuationCache:
+    """Gets the cache shared by every page in the process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ValuationCache()
+        return _cache
+
+
+def get_snapshot_values(projection_type: str, is_rollup: bool = True) -> pd.DataFrame:
+    """
+    Gets the player values for the projection type from the current stats
+    snapshot. See `get_scoring_minutes_combo`. The frame is shared, so copy it
+    before modifying it.
+    """
+    snapshot = get_stats_snapshot()
+    return get_valuation_cache().get(
+        (snapshot.version, projection_type, is_rollup),
+        lambda: get_scoring_minutes_combo(
+            projection_type, snapshot.stats_df, is_rollup=is_rollup
+        ),
+    )
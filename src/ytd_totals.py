@@ -0,0 +1,109 @@
+"""
+Keeps the running season totals from the Ottoneu leaderboard in the local
+artifact store, so a refresh only has to pull the games played since the last
+one. Each season's totals are stored as their own artifact, eg
+ytd_totals_2025-26, so a new season starts from scratch, and the version of
+each saved totals artifact is the last day it covers.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+import pandas as pd
+
+from artifacts import (get_latest_version, load_artifact, save_artifact,
+                       version_to_datetime)
+from calc_stats import per_game_stat_sources
+from leagues import get_league_leaderboard
+
+logging.basicConfig(level=logging.INFO)
+
+YTD_TOTALS_ARTIFACT = "ytd_totals"
+# opening nights by season. other seasons are pulled from October 1st, since
+# there are no games to pick up before the opener
+season_openers = {"2025-26": date(2025, 10, 21)}
+# the same league the full season leaderboard is pulled from
+LEADERBOARD_LEAGUE_ID = 31
+
+# leaderboard columns that can be summed across date ranges
+additive_cols = ["minutes", "games_played"] + [
+    totals for _, totals in per_game_stat_sources.values()
+]
+
+
+def add_leaderboard_totals(
+    totals: pd.DataFrame, new_games: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Adds the leaderboard for a new range of games into the running totals.
+    Players new to the leaderboard are added, and the columns that aren't
+    counting stats, like the name and salary, take their newest values. Any
+    per game rates are not recomputed.
+    """
+    totals = totals.set_index("ottoneu_player_id")
+    new_games = new_games.set_index("ottoneu_player_id")
+    sum_cols: List[str] = [
+        col for col in additive_cols if col in totals and col in new_games
+    ]
+    combined = new_games.combine_first(totals)
+    combined[sum_cols] = totals[sum_cols].add(new_games[sum_cols], fill_value=0)
+    return combined.reset_index()[totals.reset_index().columns]
+
+
+def get_season(day: date) -> str:
+    """
+    Gets the season the day belongs to, eg 2025-26. The offseason from August
+    on counts toward the next season.
+    """
+    start_year = day.year if day.month >= 8 else day.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def get_season_opener(season: str) -> date:
+    return season_openers.get(season, date(int(season[:4]), 10, 1))
+
+
+def get_incremental_leaderboard(today: Optional[date] = None) -> pd.DataFrame:
+    """
+    Gets the season totals through yesterday. Only the games since the stored
+    totals are pulled, with the first run of each season pulling the whole
+    season so far. Today's games are left out since they may still be in
+    progress. Before the season's opener, there are no totals to keep, so the
+    Ottoneu leaderboard is returned as is.
+    """
+    through_date = (today or date.today()) - timedelta(days=1)
+    season = get_season(through_date)
+    artifact = f"{YTD_TOTALS_ARTIFACT}_{season}"
+    version = get_latest_version(artifact)
+    if version is not None:
+        last_date = version_to_datetime(version).date()
+        totals = load_artifact(artifact, version)
+        if last_date >= through_date:
+            return totals
+        start_date = last_date + timedelta(days=1)
+    else:
+        totals = None
+        start_date = get_season_opener(season)
+        if start_date > through_date:
+            logging.info(f"The {season} season hasn't started yet")
+            return get_league_leaderboard(LEADERBOARD_LEAGUE_ID)
+
+    logging.info(f"Pulling the leaderboard for {start_date} through {through_date}")
+    new_games = get_league_leaderboard(
+        LEADERBOARD_LEAGUE_ID,
+        start_date=start_date.isoformat(),
+        end_date=through_date.isoformat(),
+    )
+    if totals is not None:
+        num_played = (new_games.minutes > 0).sum()
+        logging.info(f"Adding games for {num_played} players to the totals")
+        totals = add_leaderboard_totals(totals, new_games)
+    else:
+        totals = new_games
+    save_artifact(
+        totals,
+        artifact,
+        run_time=datetime.combine(through_date, datetime.min.time()),
+    )
+    return totals
@@ -0,0 +1,66 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import artifacts  # type: ignore
+import utils  # type: ignore
+
+
+def test_save_and_load_artifact(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path))
+    df = pd.DataFrame({"player": ["a", "b"], "value": [1.0, 2.0], "games": [3, 4]})
+
+    for day in range(1, 5):
+        artifacts.save_artifact(df, "values", datetime(2025, 1, day), num_keep=3)
+
+    assert artifacts.list_artifact_versions("values") == [
+        "20250102T000000",
+        "20250103T000000",
+        "20250104T000000",
+    ]
+    assert artifacts.get_latest_version("values") == "20250104T000000"
+    pd.testing.assert_frame_equal(artifacts.load_artifact("values"), df)
+    pd.testing.assert_frame_equal(
+        artifacts.load_artifact("values", columns=["player", "games"]),
+        df[["player", "games"]],
+    )
+
+
+def test_get_values_df_pulls_only_newer_published_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path))
+    df = pd.DataFrame({"player": ["a"], "trad_points_value_ros": [10.0]})
+    artifacts.save_artifact(df, utils.VALUES_ARTIFACT, datetime(2025, 1, 1, 8))
+    new_df = pd.DataFrame({"player": ["a"], "trad_points_value_ros": [12.0]})
+    published = [datetime(2025, 1, 1, 8)]
+    pulls = list()
+
+    def get_published_run_date():
+        if not published:
+            raise OSError("offline")
+        return published[0]
+
+    def read_csv(*args, **kwargs):
+        pulls.append(1)
+        return new_df
+
+    monkeypatch.setattr(utils, "get_published_run_date", get_published_run_date)
+    monkeypatch.setattr(utils.pd, "read_csv", read_csv)
+
+    # the local run is the published one, even though the file was just written
+    pd.testing.assert_frame_equal(utils.get_values_df(), df)
+    assert pulls == list()
+
+    # a newer run was published, so it's pulled and stored
+    published[0] = datetime(2025, 1, 2, 8)
+    pd.testing.assert_frame_equal(utils.get_values_df(), new_df)
+    assert pulls == [1]
+    assert utils.get_values_run_date() == "2025-01-02 08:00:00"
+
+    # the local run is served when the sheet can't be reached
+    published.clear()
+    pd.testing.assert_frame_equal(utils.get_values_df(), new_df)
+    assert pulls == [1]
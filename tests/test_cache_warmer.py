@@ -0,0 +1,111 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import cache_warmer  # type: ignore
+import stats_snapshot  # type: ignore
+import swr_cache  # type: ignore
+
+
+def test_run_once_warms_popular_leagues_before_expiry(monkeypatch):
+    now = [0.0]
+    fetches = list()
+
+    def get_rosters(league_id):
+        fetches.append(league_id)
+        return pd.DataFrame({"ottoneu_player_id": [1], "salary": [league_id]})
+
+    cache = swr_cache.SWRCache(
+        get_rosters, ttl=100, stale_ttl=100, clock=lambda: now[0]
+    )
+    for league_id, num_requests in [(26, 3), (31, 2), (5, 1)]:
+        for _ in range(num_requests):
+            cache.get(league_id)
+    snapshot_warms = list()
+    monkeypatch.setattr(
+        cache_warmer,
+        "peek_stats_snapshot",
+        lambda: stats_snapshot.StatsSnapshot("v1", 0.0, pd.DataFrame()),
+    )
+    monkeypatch.setattr(
+        cache_warmer, "warm_stats_snapshot", lambda: snapshot_warms.append(1)
+    )
+    warmer = cache_warmer.CacheWarmer(
+        {"league_rosters": cache}, num_leagues=2, lead_time=20, clock=lambda: now[0]
+    )
+
+    schedule = warmer.schedule()
+    assert schedule.args.tolist() == [(), (26,), (31,)]
+    assert schedule.warm_in.tolist()[1:] == [80, 80]
+
+    now[0] = 50.0
+    assert warmer.run_once() == list()
+
+    # within the lead time of expiry, so the top two leagues are refetched
+    now[0] = 85.0
+    fetches.clear()
+    assert warmer.run_once() == ["league_rosters(26,)", "league_rosters(31,)"]
+    assert fetches == [26, 31]
+    assert warmer.last_warmed[("league_rosters", (26,))] == 85.0
+    assert cache.get_age(26) == 0
+    # warming doesn't count as a request
+    assert cache.requests[(26,)] == 3
+    assert snapshot_warms == list()
+
+    # the snapshot is warmed once it nears its own TTL
+    now[0] = stats_snapshot.SNAPSHOT_TTL
+    warmer.run_once()
+    assert snapshot_warms == [1]
+
+
+def test_run_once_backs_off_after_a_failed_warm(monkeypatch):
+    now = [0.0]
+    attempts = list()
+
+    def failing_warm():
+        attempts.append(now[0])
+        raise OSError("DARKO is down")
+
+    monkeypatch.setattr(cache_warmer, "peek_stats_snapshot", lambda: None)
+    monkeypatch.setattr(cache_warmer, "warm_stats_snapshot", failing_warm)
+    warmer = cache_warmer.CacheWarmer(dict(), clock=lambda: now[0])
+
+    warmer.run_once()
+    now[0] = cache_warmer.DEFAULT_INTERVAL
+    warmer.run_once()
+    assert attempts == [0.0]
+
+    now[0] = cache_warmer.RETRY_SECONDS
+    warmer.run_once()
+    assert attempts == [0.0, cache_warmer.RETRY_SECONDS]
+
+
+def test_league_only_warmer_skips_the_unbuilt_snapshot(monkeypatch):
+    now = [0.0]
+    cache = swr_cache.SWRCache(
+        lambda league_id: league_id, ttl=100, stale_ttl=100, clock=lambda: now[0]
+    )
+    cache.get(26)
+    snapshot_warms = list()
+    monkeypatch.setattr(cache_warmer, "peek_stats_snapshot", lambda: None)
+    monkeypatch.setattr(
+        cache_warmer, "warm_stats_snapshot", lambda: snapshot_warms.append(1)
+    )
+    warmer = cache_warmer.CacheWarmer(
+        {"league_rosters": cache},
+        lead_time=20,
+        clock=lambda: now[0],
+        warm_snapshot=False,
+    )
+
+    now[0] = 85.0
+    assert warmer.run_once() == ["league_rosters(26,)"]
+    assert snapshot_warms == list()
+
+    # a page that reads the snapshot turns its warming on
+    warmer.warm_snapshot = True
+    assert warmer.run_once() == ["stats_snapshot()"]
+    assert snapshot_warms == [1]
@@ -0,0 +1,157 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+import calc_stats  # type: ignore
+
+
+def test_calc_player_values():
+    fantasy_df = pd.DataFrame(
+        {
+            "nba_player_id": [1, 2, 3, 4, 5, 6],
+            "simple_points": [40.0, 30.0, 20.0, 10.0, 5.0, 2.0],
+            "simple_points_position": ["C", "F", "G", "C", "F", "G"],
+        }
+    )
+    values = calc_stats.calc_player_values(
+        fantasy_df, scoring_type="simple_points", draftable_players=[1, 2, 3]
+    )
+
+    # replacement levels are C = 10, F = 5, G = 2
+    expected_above_repl = [30.0, 25.0, 18.0, 0.0, 0.0, 0.0]
+    surplus_factor = (4800 - 3) / 73.0
+    expected_values = [
+        round(val * surplus_factor + 1, 1) if val > 0 else 0
+        for val in expected_above_repl
+    ]
+
+    assert fantasy_df.points_above_repl.tolist() == expected_above_repl
+    assert np.allclose(values.tolist(), expected_values)
+
+
+def test_calc_sgp_kernel():
+    sgp_values = {
+        "pts": 100.0,
+        "reb": 40.0,
+        "ast": 25.0,
+        "stl": 8.0,
+        "blk": 5.0,
+        "ftm": 20.0,
+        "tov": -10.0,
+        "fg%": 0.005,
+        "3pt%": 0.004,
+        "avg_team_fgm": 300.0,
+        "avg_team_fga": 600.0,
+        "avg_team_fg_pct": 0.5,
+        "avg_team_fg3m": 90.0,
+        "avg_team_fg3a": 250.0,
+        "avg_team_fg3_pct": 0.36,
+    }
+    # pts, reb, ast, stl, blk, ftm, tov, fgm, fga, fg3m, fg3a
+    stats = np.array(
+        [[200.0, 80.0, 50.0, 16.0, 10.0, 40.0, 30.0, 60.0, 100.0, 10.0, 0.0]]
+    )
+
+    sgp = calc_stats.calc_sgp_kernel(stats, sgp_values)
+    sgp_32 = calc_stats.calc_sgp_kernel(stats.astype(np.float32), sgp_values)
+
+    expected = [2.0, 2.0, 2.0, 2.0, 2.0, 2.0, -3.0]
+    expected.append((360.0 / 700.0 - 0.5) / 0.005)
+    expected.append((100.0 / 250.0 - 0.36) / 0.004)
+    expected.append(sum(expected))
+    assert sgp.shape == (1, len(calc_stats.sgp_categories) + 1)
+    assert np.allclose(sgp[0], expected)
+    assert sgp_32.dtype == np.float32
+    assert np.allclose(sgp_32[0], expected, rtol=1e-5)
+
+
+def test_calc_all_fantasy_pts():
+    stats_df = pd.DataFrame(
+        {
+            "pts_game": [20.0, 10.0],
+            "reb_game": [5.0, 10.0],
+            "ast_game": [5.0, 2.0],
+            "stl_game": [1.0, 1.0],
+            "blk_game": [0.0, 2.0],
+            "tov_game": [3.0, 1.0],
+            "fga_game": [15.0, 8.0],
+            "fgm_game": [8.0, 5.0],
+            "fta_game": [4.0, 2.0],
+            "ftm_game": [3.0, 1.0],
+        }
+    )
+    systems = dict(calc_stats.scoring_systems, rebounds_only={"rebounds": 1})
+
+    fantasy_pts = calc_stats.calc_all_fantasy_pts(stats_df, systems)
+
+    assert fantasy_pts.columns.tolist() == [
+        "simple_points",
+        "trad_points",
+        "rebounds_only",
+    ]
+    assert fantasy_pts.simple_points.tolist() == [28.0, 24.0]
+    assert fantasy_pts.trad_points.tolist() == [33.0, 35.0]
+    assert fantasy_pts.rebounds_only.tolist() == [5.0, 10.0]
+    assert calc_stats.calc_fantasy_pts(stats_df, is_simple_scoring=False).equals(
+        fantasy_pts.trad_points
+    )
+    with pytest.raises(ValueError):
+        calc_stats.calc_all_fantasy_pts(stats_df, {"bad": {"dunks": 2}})
+
+
+def test_calc_all_per_game_projections():
+    stats_df = pd.DataFrame(
+        {
+            col: [1.0, 2.0]
+            for col in calc_stats.per_game_keep_cols
+            if col not in calc_stats.per_game_stat_sources
+        }
+    )
+    for per_100, totals in calc_stats.per_game_stat_sources.values():
+        stats_df[per_100] = [10.0, 20.0]
+        stats_df[totals] = [300.0, 400.0]
+    stats_df["pace"] = [100.0, 96.0]
+    stats_df["minutes"] = [24.0, 36.0]
+    stats_df["total_ros_minutes"] = [480.0, 960.0]
+    original_df = stats_df.copy()
+
+    projections = calc_stats.calc_all_per_game_projections(
+        stats_df, ["current", "rest_of_season", "year_to_date"]
+    )
+
+    pd.testing.assert_frame_equal(stats_df, original_df)
+    for projections_df in projections.values():
+        assert projections_df.columns.tolist() == calc_stats.per_game_keep_cols
+    # 50 and 72 possessions played
+    assert np.allclose(projections["current"].pts_game, [5.0, 14.4])
+    # 1000 and 1920 possessions played
+    assert np.allclose(projections["rest_of_season"].pts_game, [100.0, 384.0])
+    assert projections["year_to_date"].pts_game.tolist() == [300.0, 400.0]
+    with pytest.raises(ValueError):
+        calc_stats.calc_per_game_projections(stats_df, "next_season")
+
+
+def test_add_per_game_rates():
+    df = pd.DataFrame(
+        {
+            "trad_points": [100.0, 50.0, 10.0],
+            "simple_points": [60.0, 30.0, 5.0],
+            "games_forecast": [3.0, 0.0, np.nan],
+        }
+    )
+
+    df = calc_stats.add_per_game_rates(
+        df,
+        {"tfppg": "trad_points", "sfppg": "simple_points"},
+        games_col="games_forecast",
+        decimals=2,
+    )
+
+    assert df.tfppg.tolist()[:2] == [33.33, 0.0]
+    assert df.sfppg.tolist()[:2] == [20.0, 0.0]
+    assert df[["tfppg", "sfppg"]].iloc[2].isna().all()
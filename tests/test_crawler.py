@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+import crawler  # type: ignore
+
+
+def test_crawl_leagues_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawler, "CHECKPOINT_DIR", str(tmp_path))
+    crawled = list()
+
+    def flaky_fetch(league_id):
+        crawled.append(league_id)
+        if league_id == 3:
+            raise ConnectionError("dropped")
+        return {"league_id": league_id, "pts": np.float64(league_id / 10)}
+
+    with pytest.raises(ConnectionError):
+        crawler.crawl_leagues([1, 2, 3], flaky_fetch, "test", max_workers=1)
+    assert sorted(crawled) == [1, 2, 3]
+
+    def fetch(league_id):
+        crawled.append(league_id)
+        return None if league_id == 4 else {"league_id": league_id}
+
+    results = crawler.crawl_leagues([1, 2, 3, 4], fetch, "test")
+    assert sorted(crawled[3:]) == [3, 4]
+    assert results == {
+        1: {"league_id": 1, "pts": 0.1},
+        2: {"league_id": 2, "pts": 0.2},
+        3: {"league_id": 3},
+        4: None,
+    }
+
+    crawler.clear_checkpoint("test")
+    assert crawler.load_checkpoint("test") == dict()
+
+
+def test_crawl_leagues_recrawls_stale_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawler, "CHECKPOINT_DIR", str(tmp_path))
+    now = [1_000_000.0]
+    monkeypatch.setattr(crawler.time, "time", lambda: now[0])
+    crawled = list()
+
+    def fetch(league_id):
+        crawled.append(league_id)
+        return {"league_id": league_id, "crawled": now[0]}
+
+    crawler.crawl_leagues([1, 2], fetch, "test")
+    now[0] += crawler.DEFAULT_MAX_AGE / 2
+    crawler.crawl_leagues([1, 2], fetch, "test")
+    assert crawled == [1, 2]
+
+    # a day later, say after a failed upload, the old pages aren't reused
+    now[0] += 24 * 60 * 60
+    results = crawler.crawl_leagues([1, 2], fetch, "test")
+    assert sorted(crawled[2:]) == [1, 2]
+    assert results[1]["crawled"] == now[0]
@@ -0,0 +1,92 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import free_agent_pool  # type: ignore
+import stats_snapshot  # type: ignore
+import swr_cache  # type: ignore
+import valuation_cache  # type: ignore
+
+
+def _make_ros_df():
+    return pd.DataFrame(
+        {
+            "player": ["A", "B", "C", "D", "E"],
+            "ottoneu_player_id": [1.0, 2.0, 3.0, np.nan, 5.0],
+            "ottoneu_position": ["G", "F", "C", "G", "F"],
+            "games_forecast": [50.0, 40.0, 30.0, 20.0, 0.0],
+            "total_ros_minutes": [1500.0, 1000.0, 600.0, 300.0, 0.0],
+            "simple_points": [1000.0, 1200.0, 400.0, 300.0, 0.0],
+            "simple_points_value": [20.0, 30.0, 0.0, 0.0, 0.0],
+        }
+    )
+
+
+def test_get_free_agents_drops_rostered_players(monkeypatch):
+    average_values_df = pd.DataFrame(
+        {
+            "ottoneu_player_id": [1, 2, 3],
+            "avg_salary": [10.0, 25.0, 1.0],
+            "median_salary": [9.0, 20.0, 1.0],
+            "roster%": [90.0, 100.0, 10.0],
+        }
+    )
+    pool = free_agent_pool.build_free_agent_pool(
+        _make_ros_df(), average_values_df, "simple_points"
+    )
+    monkeypatch.setattr(free_agent_pool, "get_free_agent_pool", lambda _: pool)
+
+    free_agents = free_agent_pool.get_free_agents("simple_points", [2, 4])
+
+    # E has no games forecast, and D has no Ottoneu ID so it's never rostered
+    assert free_agents.index.tolist() == ["A", "C", "D"]
+    assert free_agents.simple_points_ppg.tolist() == [20.0, 400.0 / 30, 15.0]
+    assert free_agents.avg_salary.tolist()[:2] == [10.0, 1.0]
+    assert "ottoneu_player_id" not in free_agents
+    assert pool.ottoneu_player_id.tolist() == [2, 1, 3, -1]
+
+
+def test_get_free_agent_pool_is_keyed_by_the_average_values_fetch(monkeypatch):
+    now = [0.0]
+    fetches = list()
+    builds = list()
+
+    def get_average_values():
+        fetches.append(1)
+        return pd.DataFrame({"ottoneu_player_id": [1], "avg_salary": [10.0]})
+
+    def build_free_agent_pool(ros_df, average_values_df, league_scoring):
+        builds.append(average_values_df)
+        return pd.DataFrame({"ottoneu_player_id": [1]})
+
+    average_values = swr_cache.SWRCache(
+        get_average_values, ttl=60, stale_ttl=60, clock=lambda: now[0]
+    )
+    monkeypatch.setattr(free_agent_pool.get_average_values, "cache", average_values)
+    monkeypatch.setattr(
+        free_agent_pool,
+        "get_stats_snapshot",
+        lambda: stats_snapshot.StatsSnapshot("v1", 0.0, pd.DataFrame()),
+    )
+    monkeypatch.setattr(
+        free_agent_pool, "get_snapshot_values", lambda *args, **kwargs: None
+    )
+    shared_cache = valuation_cache.ValuationCache()
+    monkeypatch.setattr(free_agent_pool, "get_valuation_cache", lambda: shared_cache)
+    monkeypatch.setattr(free_agent_pool, "build_free_agent_pool", build_free_agent_pool)
+
+    free_agent_pool.get_free_agent_pool("simple_points")
+    free_agent_pool.get_free_agent_pool("simple_points")
+    assert len(fetches) == 1 and len(builds) == 1
+    # built from the cached frame itself, not a copy
+    assert builds[0] is average_values.get_entry().value
+
+    # a new fetch of the average values rebuilds the pool
+    now[0] = 10.0
+    average_values.refresh()
+    free_agent_pool.get_free_agent_pool("simple_points")
+    assert len(fetches) == 2 and len(builds) == 2
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.abspath("src"))
+
+import http_client  # type: ignore
+import leagues  # type: ignore
+
+
+def test_token_bucket_spaces_requests():
+    now = [0.0]
+    sleeps = list()
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = http_client.TokenBucket(
+        rate=0.5, capacity=1, clock=lambda: now[0], sleep=sleep
+    )
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 2
+    now[0] += 1
+    assert bucket.acquire() == 1
+    assert sleeps == [2, 1]
+
+
+def test_get_endpoint_groups_league_ids():
+    assert (
+        http_client.get_endpoint("https://ottoneu.fangraphs.com/basketball/26/settings")
+        == "/basketball/{id}/settings"
+    )
+    assert (
+        http_client.get_endpoint(
+            "https://ottoneu.fangraphs.com/basketball/26/standings/5"
+        )
+        == "/basketball/{id}/standings/{id}"
+    )
+
+
+def test_client_retries_server_errors(monkeypatch):
+    client = http_client.OttoneuClient(rate=1000, backoff=0)
+    statuses = [503, 200]
+
+    def fake_get(url, **kwargs):
+        assert kwargs["timeout"] == http_client.DEFAULT_TIMEOUT
+        response = requests.Response()
+        response.status_code = statuses.pop(0)
+        return response
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    response = client.get("https://ottoneu.fangraphs.com/basketball/26/settings")
+
+    assert response.status_code == 200
+    stats = client.latency_stats()["/basketball/{id}/settings"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+
+
+def test_league_csvs_go_through_the_client(monkeypatch):
+    client = http_client.OttoneuClient(rate=1000, backoff=0)
+    responses = {
+        "rosters": (200, b"Player ID,Salary,Position(s)\n1,$12,G\n"),
+        "average_values": (404, b"<html>Not Found</html>"),
+    }
+
+    def fake_get(url, **kwargs):
+        assert kwargs["timeout"] == http_client.DEFAULT_TIMEOUT
+        response = requests.Response()
+        response.status_code, response._content = next(
+            value for key, value in responses.items() if key in url
+        )
+        return response
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    monkeypatch.setattr(leagues, "get_client", lambda: client)
+
+    rosters = leagues.get_league_rosters.cache.func(26)
+    assert rosters.to_dict(orient="records") == [
+        {"ottoneu_player_id": 1, "salary": 12, "position": "G"}
+    ]
+    with pytest.raises(requests.HTTPError):
+        leagues.get_average_values.cache.func()
+    assert client.latency_stats()["/basketball/{id}/csv/rosters"]["requests"] == 1
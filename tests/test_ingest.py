@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+from urllib.error import HTTPError, URLError
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+from ingest import fetch_sources  # type: ignore
+
+
+def test_fetch_sources_retries_failed_sources():
+    calls = list()
+
+    def flaky_fetch():
+        calls.append(1)
+        if len(calls) < 2:
+            raise URLError("connection reset")
+        return pd.DataFrame({"a": [1]})
+
+    frames, timings = fetch_sources(
+        {"flaky": flaky_fetch, "steady": lambda: pd.DataFrame({"b": [2]})},
+        backoff=0,
+    )
+    assert frames["flaky"].equals(pd.DataFrame({"a": [1]}))
+    assert frames["steady"].equals(pd.DataFrame({"b": [2]}))
+    assert timings["flaky"]["attempts"] == 2
+    assert timings["steady"]["attempts"] == 1
+
+
+def test_fetch_sources_only_retries_transient_errors():
+    calls = {"missing": 0, "throttled": 0}
+
+    def missing_fetch():
+        calls["missing"] += 1
+        raise HTTPError("https://example.com", 404, "Not Found", None, None)
+
+    def throttled_fetch():
+        calls["throttled"] += 1
+        if calls["throttled"] < 3:
+            raise HTTPError("https://example.com", 429, "Too Many Requests", None, None)
+        return pd.DataFrame({"a": [1]})
+
+    with pytest.raises(HTTPError):
+        fetch_sources({"missing": missing_fetch}, backoff=0)
+    assert calls["missing"] == 1
+
+    _, timings = fetch_sources({"throttled": throttled_fetch}, backoff=0)
+    assert timings["throttled"]["attempts"] == 3
+
+
+def test_fetch_sources_times_out_slow_sources():
+    def slow_fetch():
+        time.sleep(1)
+        return pd.DataFrame()
+
+    with pytest.raises(TimeoutError):
+        fetch_sources({"slow": slow_fetch}, timeouts={"slow": 0.05})
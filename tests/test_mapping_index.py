@@ -0,0 +1,59 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import mapping_index  # type: ignore
+
+MAPPINGS_CSV = """ottoneu_player_id,name,nba_player_id,stats_player_id,bref_id,espn_id,hashtag_id,ottoneu_position
+232,Giannis Antetokounmpo,203507,739957,antetgi01,3032977,9325,F
+414,Joel Embiid,203954,794508,embiijo01,3059318,9418,F/C
+20654,Tyty Washington Jr.,1631207,,,,38657,G
+20654,TyTy Washington Jr.,1631207,,,,38657,G
+500,Rookie,,,,,,
+"""
+
+
+def test_load_mappings_only_parses_changed_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(mapping_index, "MAPPING_CACHE_DIR", str(tmp_path / "index"))
+    path = tmp_path / "mappings.csv"
+    path.write_text(MAPPINGS_CSV)
+    num_parses = list()
+    read_csv = pd.read_csv
+    monkeypatch.setattr(
+        mapping_index.pd,
+        "read_csv",
+        lambda *args, **kwargs: num_parses.append(1) or read_csv(*args, **kwargs),
+    )
+
+    first = mapping_index.load_mappings(str(path))
+    second = mapping_index.load_mappings(str(path))
+    path.write_text(MAPPINGS_CSV.replace("Rookie", "Rookie Jr."))
+    changed = mapping_index.load_mappings(str(path))
+
+    assert len(num_parses) == 2
+    pd.testing.assert_frame_equal(first, second)
+    assert changed.name.iloc[-1] == "Rookie Jr."
+    assert len(os.listdir(tmp_path / "index")) == 1
+
+
+def test_mapping_index_matches_merge():
+    mappings = pd.read_csv(io.StringIO(MAPPINGS_CSV))
+    index = mapping_index.MappingIndex(mappings)
+    df = pd.DataFrame({"ottoneu_player_id": [414, 999, 20654, 232, 500]})
+
+    expected = df.merge(
+        mappings.drop_duplicates("ottoneu_player_id"),
+        on="ottoneu_player_id",
+        how="left",
+    )
+
+    pd.testing.assert_frame_equal(index.add_columns(df, "ottoneu_player_id"), expected)
+    nba_ids = index.translate([9418, np.nan, 38657], "hashtag_id", "nba_player_id")
+    assert np.array_equal(nba_ids, [203954, np.nan, 1631207], equal_nan=True)
+    assert index.lookup(203507, "nba_player_id", "name") == "Giannis Antetokounmpo"
+    assert index.lookup(1, "nba_player_id", "name") is None
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import source_cache  # type: ignore
+
+
+def test_get_source_frame_skips_transform_for_unchanged_payload(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_cache, "SOURCE_CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "source.csv"
+    source.write_text("pid,minutes\n1,30\n2,25\n")
+    transform_calls = list()
+
+    def transform(df):
+        transform_calls.append(1)
+        return df.assign(minutes=df.minutes * 2)
+
+    def get_frame():
+        return source_cache.get_source_frame(
+            "test", source.as_uri(), pd.read_csv, transform
+        )
+
+    expected = pd.DataFrame({"pid": [1, 2], "minutes": [60, 50]})
+    pd.testing.assert_frame_equal(get_frame(), expected)
+    pd.testing.assert_frame_equal(get_frame(), expected)
+    assert len(transform_calls) == 1
+
+    source.write_text("pid,minutes\n1,31\n2,25\n")
+    assert get_frame().minutes.tolist() == [62, 50]
+    assert len(transform_calls) == 2
+
+
+def test_get_source_frame_reprocesses_after_the_transform_changes(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(source_cache, "SOURCE_CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "source.csv"
+    source.write_text("pid,minutes\n1,30\n2,25\n")
+
+    def double_minutes(df):
+        return df.assign(minutes=df.minutes * 2)
+
+    def triple_minutes(df):
+        return df.assign(minutes=df.minutes * 3)
+
+    def get_frame(transform, steps_version=""):
+        return source_cache.get_source_frame(
+            "test",
+            source.as_uri(),
+            pd.read_csv,
+            transform,
+            steps_version=steps_version,
+        )
+
+    assert get_frame(double_minutes).minutes.tolist() == [60, 50]
+    assert get_frame(triple_minutes).minutes.tolist() == [90, 75]
+    # a changed helper in another module can't be seen, so it's flagged with
+    # the version
+    calls = list()
+
+    def counted_transform(df):
+        calls.append(1)
+        return df
+
+    get_frame(counted_transform)
+    get_frame(counted_transform)
+    get_frame(counted_transform, steps_version="2")
+    assert len(calls) == 2
+    # no temporary files are left behind
+    assert not [
+        file_name
+        for file_name in os.listdir(tmp_path / "cache" / "test")
+        if file_name.endswith(".tmp")
+    ]
+
+
+def test_steps_version_covers_helpers_in_the_same_module(tmp_path, monkeypatch):
+    module_path = tmp_path / "fake_source.py"
+    module_path.write_text(
+        "def scale(df):\n    return df * 2\n\n\n"
+        "def transform(df):\n    return scale(df)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import fake_source  # type: ignore
+
+    version = source_cache._steps_version("", pd.read_csv, fake_source.transform)
+    # only the helper changes
+    module_path.write_text(module_path.read_text().replace("* 2", "* 3"))
+    assert (
+        source_cache._steps_version("", pd.read_csv, fake_source.transform) != version
+    )
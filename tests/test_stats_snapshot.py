@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+import stats_snapshot  # type: ignore
+
+
+def test_get_stats_snapshot_builds_once_per_window(monkeypatch):
+    builds = list()
+
+    def prep_stats_df():
+        builds.append(1)
+        if len(builds) >= 3:
+            raise OSError("DARKO is down")
+        return pd.DataFrame({"nba_player_id": [1.0, 2.0], "minutes": [30.0, 12.0]})
+
+    monkeypatch.setattr(stats_snapshot, "prep_stats_df", prep_stats_df)
+    stats_snapshot.clear_stats_snapshot()
+
+    first = stats_snapshot.get_stats_snapshot()
+    assert stats_snapshot.get_stats_df() is first.stats_df
+    assert len(builds) == 1
+
+    # an identical rebuild keeps the version
+    rebuilt = stats_snapshot.get_stats_snapshot(max_age=0)
+    assert len(builds) == 2
+    assert rebuilt.version == first.version
+    assert rebuilt.stats_df is not first.stats_df
+
+    # a failed rebuild serves the old snapshot and holds off on retrying
+    assert stats_snapshot.get_stats_snapshot(max_age=0) is rebuilt
+    assert stats_snapshot.get_stats_snapshot(max_age=0) is rebuilt
+    assert len(builds) == 3
+
+    stats_snapshot.clear_stats_snapshot()
+    with pytest.raises(OSError):
+        stats_snapshot.get_stats_snapshot()
+    stats_snapshot.clear_stats_snapshot()
+
+
+def test_get_frame_version_changes_with_contents():
+    df = pd.DataFrame({"nba_player_id": [1.0, 2.0], "minutes": [30.0, 12.0]})
+
+    assert stats_snapshot.get_frame_version(df) == stats_snapshot.get_frame_version(
+        df.copy()
+    )
+    assert stats_snapshot.get_frame_version(df) != stats_snapshot.get_frame_version(
+        df.assign(minutes=[30.0, 13.0])
+    )
+    assert stats_snapshot.get_frame_version(df) != stats_snapshot.get_frame_version(
+        df.rename(columns={"minutes": "minutes_ytd"})
+    )
@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+import swr_cache  # type: ignore
+
+
+def test_concurrent_misses_share_one_call():
+    calls = list()
+
+    def get_rosters(league_id):
+        calls.append(league_id)
+        time.sleep(0.05)
+        return pd.DataFrame({"ottoneu_player_id": [league_id], "salary": [10]})
+
+    cache = swr_cache.SWRCache(get_rosters, ttl=60, stale_ttl=60)
+    results = list()
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(26))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [26]
+    assert cache.stats["misses"] == 1 and cache.stats["waits"] == 4
+    # every caller gets its own copy
+    results[0].loc[0, "salary"] = 99
+    assert cache.get(26).salary.tolist() == [10]
+
+
+def test_expired_entries_are_served_while_refreshing():
+    now = [0.0]
+    version = [0]
+    release = threading.Event()
+
+    def get_scoring(league_id):
+        if version[0]:
+            release.wait(1)
+        version[0] += 1
+        return f"points_v{version[0]}"
+
+    cache = swr_cache.SWRCache(get_scoring, ttl=10, stale_ttl=10, clock=lambda: now[0])
+    assert cache.get(1) == "points_v1"
+
+    now[0] = 15.0
+    # stale, so the old value comes back right away and one refresh starts
+    assert cache.get(1) == "points_v1"
+    assert cache.get(1) == "points_v1"
+    refresh = cache._inflight[(1,)]
+    release.set()
+    refresh.result(timeout=1)
+
+    assert cache.stats["stale_hits"] == 2
+    assert cache.get(1) == "points_v2"
+
+    # too old to serve stale, so the caller waits on the call
+    now[0] = 100.0
+    assert cache.get(1) == "points_v3"
+
+
+def test_failed_refresh_keeps_stale_value():
+    now = [0.0]
+    results = ["categories"]
+
+    def get_scoring(league_id):
+        if not results:
+            raise ValueError("Ottoneu is down")
+        return results.pop()
+
+    cache = swr_cache.SWRCache(get_scoring, ttl=10, stale_ttl=10, clock=lambda: now[0])
+    cache.get(1)
+    now[0] = 15.0
+    cache.get(1)
+    refresh = cache._inflight.get((1,))
+    if refresh is not None:
+        refresh.exception(timeout=1)
+
+    assert cache.get(1) == "categories"
+
+
+def test_entries_and_request_counts_are_bounded():
+    cache = swr_cache.SWRCache(
+        lambda league_id: league_id, ttl=60, stale_ttl=60, max_entries=2, decay_every=8
+    )
+    for league_id in [1, 2, 1, 3]:
+        cache.get(league_id)
+
+    # 2 was the least recently used when 3 came in
+    assert list(cache._entries) == [(1,), (3,)]
+
+    for _ in range(3):
+        cache.get(1)
+    # the eighth request halves the counts, dropping the keys asked for once
+    cache.get(4)
+    assert dict(cache.requests) == {(1,): 2}
+    assert cache.most_requested(5) == [(1,)]
+
+
+def test_failed_refreshes_back_off():
+    now = [0.0]
+    calls = list()
+
+    def get_rosters(league_id):
+        calls.append(now[0])
+        if len(calls) > 1:
+            raise OSError("Ottoneu is down")
+        return "rosters"
+
+    cache = swr_cache.SWRCache(
+        get_rosters, ttl=10, stale_ttl=1000, retry_seconds=100, clock=lambda: now[0]
+    )
+    cache.get(26)
+    now[0] = 20.0
+    assert cache.get(26) == "rosters"
+    cache._inflight[(26,)].exception(timeout=1)
+
+    # still within the retry window, so no new refresh is started
+    now[0] = 50.0
+    assert cache.get(26) == "rosters"
+    assert (26,) not in cache._inflight
+    assert calls == [0.0, 20.0]
+
+    now[0] = 130.0
+    cache.get(26)
+    cache._inflight[(26,)].exception(timeout=1)
+    assert calls == [0.0, 20.0, 130.0]
+
+
+def test_waits_on_a_hung_call_are_bounded():
+    release = threading.Event()
+    calls = list()
+
+    def get_rosters(league_id):
+        calls.append(league_id)
+        if len(calls) == 1:
+            release.wait(5)
+        return "rosters"
+
+    cache = swr_cache.SWRCache(get_rosters, ttl=60, stale_ttl=60, wait_timeout=0.05)
+    hung = threading.Thread(target=lambda: cache.get(26))
+    hung.start()
+    while not calls:
+        time.sleep(0.01)
+
+    with pytest.raises(TimeoutError):
+        cache.get(26)
+    # the hung call no longer holds up the key
+    assert cache.get(26) == "rosters"
+    assert calls == [26, 26]
+    release.set()
+    hung.join()
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath("src"))
+
+from tables import (convert_numeric_columns,  # type: ignore
+                    extract_table, extract_tables)
+
+STANDINGS_FIXTURE = "tests/fixtures/standings.html"
+
+
+def soup_table(table) -> pd.DataFrame:
+    headers = [
+        th.text.lower().strip() for th in table.find("thead").find("tr").find_all("th")
+    ]
+    rows = [
+        [td.text.strip() for td in row.find_all("td")]
+        for row in table.find("tbody").find_all("tr")
+    ]
+    return pd.DataFrame(rows, columns=headers)
+
+
+def test_extract_tables_matches_soup():
+    with open(STANDINGS_FIXTURE, "rb") as f:
+        html = f.read()
+    soup_tables = BeautifulSoup(html, "html.parser").find_all("table")
+
+    main_table, shots_table = extract_tables(html, [1, 2], lowercase_headers=True)
+    pd.testing.assert_frame_equal(main_table, soup_table(soup_tables[1]))
+    pd.testing.assert_frame_equal(shots_table, soup_table(soup_tables[2]))
+
+    overall_table = convert_numeric_columns(
+        main_table.merge(shots_table, on=["team", "g", "mins"])
+    )
+    assert overall_table.team.dtype == object
+    assert (overall_table.drop(columns="team").dtypes == float).all()
+
+    with pytest.raises(IndexError):
+        extract_table(html, 100)
+
+
+def test_extract_table_handles_unclosed_cells_and_containers():
+    html = """
+    <table><tbody><tr><td>outside</td></tr></tbody></table>
+    <main><table>
+    <thead><tr><th>Player<th>Salary</tr></thead>
+    <tbody><tr><td><a href="#">A &amp; B</a><td>$5
+    <tr><td>C<td>$1</tr></tbody>
+    </table></main>
+    """
+    expected = pd.DataFrame(
+        [["A & B", "$5"], ["C", "$1"]], columns=["Player", "Salary"]
+    )
+    pd.testing.assert_frame_equal(extract_table(html, container="main"), expected)
@@ -0,0 +1,209 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import calc_stats  # type: ignore
+import transform  # type: ignore
+
+
+def test_get_position_eligibility():
+    positions = pd.Series(["G", "F", "C", "G/F", "F/C", None])
+    eligibility = transform.get_position_eligibility(positions)
+
+    assert eligibility.tolist() == [1, 2, 4, 3, 6, 0]
+
+
+def test_find_surplus_positions():
+    fantasy_df = pd.DataFrame(
+        {
+            "ottoneu_position": ["C", "F/C", "G/F", "G", "F", None],
+            "simple_points": [30.0, 40.0, 20.0, 35.0, 10.0, 50.0],
+        }
+    )
+    original_cols = fantasy_df.columns.tolist()
+    positions = transform.find_surplus_positions(fantasy_df, "simple_points")
+
+    # F/C is the top center and top forward, ties go to C
+    assert positions.tolist()[:5] == ["C", "C", "F", "G", "F"]
+    assert pd.isna(positions.iloc[5])
+    assert fantasy_df.columns.tolist() == original_cols
+
+
+def test_rank_eligible_matches_pandas():
+    values = np.array([3.0, 3.0, np.nan, 1.0, 5.0, 2.0])
+    is_eligible = np.array([True, True, True, True, False, True])
+    expected = (
+        pd.Series(values[is_eligible])
+        .rank(ascending=False, na_option="bottom")
+        .tolist()
+    )
+
+    ranks = transform.rank_eligible(values, is_eligible)
+
+    assert ranks[is_eligible].tolist() == expected
+    assert np.isinf(ranks[~is_eligible]).all()
+
+
+def test_get_draftable_players():
+    fantasy_df = pd.DataFrame(
+        {
+            "nba_player_id": [1, 2, 3, 4, 5, 6, 7],
+            "ottoneu_position": ["C", "F/C", "G", "F", "G/F", "C", None],
+            "simple_points": [50.0, 45.0, 40.0, 35.0, 30.0, 25.0, 20.0],
+        }
+    )
+    quotas = dict(
+        num_centers=1, num_forwards=1, num_guards=1, num_f_c=1, num_g_f=1, num_util=1
+    )
+
+    draftable_players = transform.get_draftable_players(
+        fantasy_df, "simple_points", **quotas
+    )
+    draft_slots = transform.get_draftable_players(
+        fantasy_df, "simple_points", return_slots=True, **quotas
+    )
+
+    assert draftable_players == [1, 2, 3, 4, 5, 6]
+    assert draft_slots.to_dict() == {
+        1: "C",
+        2: "F",
+        3: "G",
+        4: "F/C",
+        5: "G/F",
+        6: "UTIL",
+    }
+
+
+def test_get_draftable_players_flex_slots_take_forwards():
+    fantasy_df = pd.DataFrame(
+        {
+            "nba_player_id": [1, 2, 3, 4, 5, 6],
+            "ottoneu_position": ["C", "C", "G", "G", "F", "F"],
+            "simple_points": [50.0, 45.0, 40.0, 35.0, 30.0, 25.0],
+        }
+    )
+    quotas = dict(
+        num_centers=1, num_forwards=0, num_guards=1, num_f_c=1, num_g_f=1, num_util=0
+    )
+
+    draft_slots = transform.get_draftable_players(
+        fantasy_df, "simple_points", return_slots=True, **quotas
+    )
+
+    # the second center and guard outscore the forwards but can't fill F/C or G/F
+    assert draft_slots.to_dict() == {1: "C", 3: "G", 5: "F/C", 6: "G/F"}
+
+
+def test_get_draftable_players_matches_slot_by_slot_selection():
+    rng = np.random.default_rng(3)
+    num_players = 300
+    fantasy_df = pd.DataFrame(
+        {
+            "nba_player_id": np.arange(num_players),
+            "ottoneu_position": rng.choice(
+                ["G", "F", "C", "G/F", "F/C", None], num_players
+            ),
+            "simple_points": rng.normal(20, 8, num_players),
+        }
+    )
+    eligibility = transform.get_position_eligibility(fantasy_df.ottoneu_position)
+    # fill each slot in turn with the best eligible players left, like the
+    # original implementation
+    expected: list = list()
+    for slot, quota in zip(transform.draft_slot_bits, [12, 24, 36, 12, 12, 36]):
+        bits = transform.draft_slot_bits[slot]
+        is_eligible = (bits == 0) | ((eligibility & bits) > 0)
+        expected.extend(
+            fantasy_df.loc[is_eligible & ~fantasy_df.nba_player_id.isin(expected)]
+            .sort_values(by="simple_points", ascending=False)
+            .nba_player_id.head(quota)
+            .tolist()
+        )
+
+    assert transform.get_draftable_players(fantasy_df, "simple_points") == expected
+
+
+def _make_sgp_rollup():
+    return pd.DataFrame(
+        {
+            "season": ["2024-25", "2025-26"],
+            "week": [22, 7],
+            **{
+                col: [val, val]
+                for col, val in {
+                    "pts": 95.0,
+                    "reb": 40.0,
+                    "ast": 25.0,
+                    "stl": 8.0,
+                    "blk": 6.0,
+                    "ftm": 18.0,
+                    "tov": 12.0,
+                    "fg%": 0.004,
+                    "3pt%": 0.005,
+                    "avg_team_fga": 700.0,
+                    "avg_team_fgm": 330.0,
+                    "avg_team_fg_pct": 0.47,
+                    "avg_team_fg3a": 280.0,
+                    "avg_team_fg3m": 100.0,
+                    "avg_team_fg3_pct": 0.36,
+                }.items()
+            },
+        }
+    )
+
+
+def _make_projections(num_players=300):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "nba_player_id": np.arange(num_players, dtype=float),
+            "hashtag_id": np.arange(num_players, dtype=float),
+            "ottoneu_position": rng.choice(["G", "F", "C", "G/F", "F/C"], num_players),
+        }
+    )
+    for col in transform.per_game_stat_sources:
+        df[col] = rng.uniform(1, 10, num_players)
+    df["fg_pct"] = df.fgm_game / df.fga_game
+    df["fg3_pct"] = df.fg3m_game / df.fg3a_game
+    return df
+
+
+def test_calc_projection_values_incremental(monkeypatch):
+    monkeypatch.setattr(calc_stats, "get_sgp_rollup", _make_sgp_rollup)
+    calls = list()
+    calc_player_values = transform.calc_player_values
+    monkeypatch.setattr(
+        transform,
+        "calc_player_values",
+        lambda *args, **kwargs: calls.append(kwargs["scoring_type"])
+        or calc_player_values(*args, **kwargs),
+    )
+    df = _make_projections()
+    _, state = transform.calc_projection_values_incremental(df.copy(), "current")
+
+    # a player at the bottom of every scoring type doesn't move the values
+    worst = df.index[-1]
+    df.loc[worst, list(transform.per_game_stat_sources)] = 0.0
+    _, state = transform.calc_projection_values_incremental(df.copy(), "current", state)
+    calls.clear()
+    df.loc[worst, "pts_game"] = 0.5
+    values_df, state = transform.calc_projection_values_incremental(
+        df.copy(), "current", state
+    )
+    assert calls == list()
+    expected = transform.calc_projection_values(df.copy(), "current")
+    pd.testing.assert_frame_equal(values_df, expected)
+
+    # but a change at the top does
+    calls.clear()
+    df.loc[df.pts_game.idxmax(), "pts_game"] += 5
+    values_df, _ = transform.calc_projection_values_incremental(
+        df.copy(), "current", state
+    )
+    assert "simple_points" in calls
+    expected = transform.calc_projection_values(df.copy(), "current")
+    pd.testing.assert_frame_equal(values_df, expected)
@@ -0,0 +1,112 @@
+import os
+import sys
+from urllib.error import URLError
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath("src"))
+
+import utils  # type: ignore
+
+
+def test_get_sgp_rollup_falls_back_to_snapshot(tmp_path, monkeypatch):
+    snapshot = tmp_path / "sgp_rollup_snapshot.csv"
+    expected = pd.DataFrame({"season": ["2024-25"], "pts": [95.0], "week": [22]})
+    expected.to_csv(snapshot, index=False)
+    read_csv = pd.read_csv
+
+    def offline_read_csv(path, *args, **kwargs):
+        if str(path).startswith("https://"):
+            raise URLError("offline")
+        return read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(utils, "SGP_ROLLUP_SNAPSHOT", str(snapshot))
+    monkeypatch.setattr(utils.pd, "read_csv", offline_read_csv)
+    utils.get_sgp_rollup.clear()
+
+    pd.testing.assert_frame_equal(utils.get_sgp_rollup(), expected)
+    utils.get_sgp_rollup.clear()
+
+
+def test_get_sgp_rollup_retries_the_sheet_after_falling_back(tmp_path, monkeypatch):
+    snapshot = tmp_path / "sgp_rollup_snapshot.csv"
+    stale = pd.DataFrame({"season": ["2024-25"], "pts": [95.0], "week": [22]})
+    stale.to_csv(snapshot, index=False)
+    fresh = pd.DataFrame({"season": ["2025-26"], "pts": [97.0], "week": [7]})
+    sheet_errors = [pd.errors.ParserError("bad sheet"), TimeoutError("timed out")]
+    read_csv = pd.read_csv
+
+    def flaky_read_csv(path, *args, **kwargs):
+        if str(path).startswith("https://"):
+            if sheet_errors:
+                raise sheet_errors.pop(0)
+            return fresh
+        return read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(utils, "SGP_ROLLUP_SNAPSHOT", str(snapshot))
+    monkeypatch.setattr(utils.pd, "read_csv", flaky_read_csv)
+    utils.get_sgp_rollup.clear()
+
+    pd.testing.assert_frame_equal(utils.get_sgp_rollup(), stale)
+    pd.testing.assert_frame_equal(utils.get_sgp_rollup(), stale)
+    # the sheet is back, so the snapshot isn't served from the cache
+    pd.testing.assert_frame_equal(utils.get_sgp_rollup(), fresh)
+    pd.testing.assert_frame_equal(read_csv(snapshot), fresh)
+    utils.get_sgp_rollup.clear()
+
+
+def test_hashtag_projections_are_downloaded_once(monkeypatch):
+    downloads = list()
+    rookie_id = int(utils.get_rookies().index[0])
+    sheet = pd.DataFrame(
+        {
+            "name": ["Rookie", "Veteran"],
+            "pid": [rookie_id, -1],
+            "games_forecast": [60, 70],
+            "minutes_forecast": [25.0, 30.0],
+            "pts_game": [12.0, 20.0],
+        }
+    )
+
+    def fake_get_source_frame(*args, **kwargs):
+        downloads.append(1)
+        return sheet
+
+    monkeypatch.setattr(utils, "get_source_frame", fake_get_source_frame)
+    utils.get_hashtag_projections.clear()
+
+    ros = utils.get_hashtag_ros_projections()
+    rookies = utils.get_hashtag_rookie_projections()
+    assert ros.columns.tolist() == [
+        "name",
+        "pid",
+        "games_forecast",
+        "minutes_forecast",
+    ]
+    assert rookies.pid.tolist() == [rookie_id]
+    assert len(downloads) == 1
+    utils.get_hashtag_projections.clear()
+
+
+def test_get_league_metadata_reads_the_sheet_once(monkeypatch):
+    reads = list()
+    sheet = pd.DataFrame(
+        {"league_id": [1, 26], "points_system": ["Categories", "Traditional Points"]}
+    )
+
+    def fake_read_csv(*args, **kwargs):
+        reads.append(1)
+        return sheet
+
+    monkeypatch.setattr(utils.pd, "read_csv", fake_read_csv)
+    utils.get_leagues_metadata.clear()
+    utils.get_leagues_metadata_index.clear()
+
+    assert utils.get_league_metadata(26)["points_system"] == "Traditional Points"
+    assert utils.get_league_metadata(1)["points_system"] == "Categories"
+    with pytest.raises(ValueError):
+        utils.get_league_metadata(2)
+    assert len(reads) == 1
+    utils.get_leagues_metadata.clear()
+    utils.get_leagues_metadata_index.clear()
@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import stats_snapshot  # type: ignore
+import valuation_cache  # type: ignore
+
+
+def test_valuation_cache_counts_hits_and_evicts_oldest():
+    cache = valuation_cache.ValuationCache(max_entries=2)
+    frames = {key: pd.DataFrame({"value": [i]}) for i, key in enumerate("abc")}
+
+    first = cache.get("a", lambda: frames["a"])
+    assert cache.get("a", lambda: frames["b"]) is first
+    cache.get("b", lambda: frames["b"])
+    cache.get("c", lambda: frames["c"])
+
+    assert cache.get("a", lambda: frames["c"]) is frames["c"]
+    assert cache.stats() == {"hits": 1, "misses": 4, "hit_rate": 0.2, "entries": 2}
+
+
+def test_valuation_cache_computes_concurrent_misses_once():
+    cache = valuation_cache.ValuationCache()
+    calls = list()
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return pd.DataFrame({"value": [1]})
+
+    results = list()
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("a", compute)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["hits"] == 3
+
+
+def test_get_snapshot_values_is_keyed_by_snapshot_version(monkeypatch):
+    stats_df = pd.DataFrame({"nba_player_id": [1.0]})
+    snapshots = [
+        stats_snapshot.StatsSnapshot("v1", 0.0, stats_df),
+        stats_snapshot.StatsSnapshot("v1", 0.0, stats_df),
+        stats_snapshot.StatsSnapshot("v2", 1.0, stats_df),
+    ]
+    calls = list()
+    monkeypatch.setattr(valuation_cache, "get_stats_snapshot", snapshots.pop)
+    monkeypatch.setattr(valuation_cache, "_cache", valuation_cache.ValuationCache())
+    monkeypatch.setattr(
+        valuation_cache,
+        "get_scoring_minutes_combo",
+        lambda projection_type, df, is_rollup: calls.append(projection_type)
+        or df.copy(),
+    )
+
+    newest = valuation_cache.get_snapshot_values("rest_of_season")
+    assert valuation_cache.get_snapshot_values("rest_of_season") is not newest
+    cached = valuation_cache.get_snapshot_values("rest_of_season")
+
+    assert len(calls) == 2
+    assert valuation_cache.get_valuation_cache().stats()["hits"] == 1
+    assert cached.equals(stats_df)
@@ -0,0 +1,97 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("src"))
+
+import artifacts  # type: ignore
+import ytd_totals  # type: ignore
+
+
+def test_add_leaderboard_totals():
+    totals = pd.DataFrame(
+        {
+            "ottoneu_player_id": [1, 2],
+            "name": ["A", "B"],
+            "salary": [10, 5],
+            "minutes": [300.0, 100.0],
+            "points": [150.0, 40.0],
+        }
+    )
+    new_games = pd.DataFrame(
+        {
+            "ottoneu_player_id": [2, 3],
+            "name": ["B", "C"],
+            "salary": [6, 1],
+            "minutes": [30.0, 12.0],
+            "points": [10.0, 4.0],
+        }
+    )
+    expected = pd.DataFrame(
+        {
+            "ottoneu_player_id": [1, 2, 3],
+            "name": ["A", "B", "C"],
+            "salary": [10, 6, 1],
+            "minutes": [300.0, 130.0, 12.0],
+            "points": [150.0, 50.0, 4.0],
+        }
+    )
+    pd.testing.assert_frame_equal(
+        ytd_totals.add_leaderboard_totals(totals, new_games), expected
+    )
+
+
+def test_get_incremental_leaderboard_pulls_only_new_games(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path))
+    pulls = list()
+
+    def fake_leaderboard(league_id, start_date, end_date):
+        pulls.append((start_date, end_date))
+        return pd.DataFrame(
+            {"ottoneu_player_id": [1], "minutes": [30.0], "points": [20.0]}
+        )
+
+    monkeypatch.setattr(ytd_totals, "get_league_leaderboard", fake_leaderboard)
+
+    ytd_totals.get_incremental_leaderboard(today=date(2025, 11, 1))
+    ytd_totals.get_incremental_leaderboard(today=date(2025, 11, 1))
+    totals = ytd_totals.get_incremental_leaderboard(today=date(2025, 11, 3))
+
+    assert pulls == [
+        ("2025-10-21", "2025-10-31"),
+        ("2025-11-01", "2025-11-02"),
+    ]
+    assert totals.minutes.tolist() == [60.0]
+    assert totals.points.tolist() == [40.0]
+
+
+def test_get_incremental_leaderboard_resets_for_a_new_season(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path))
+    pulls = list()
+
+    def fake_leaderboard(league_id, start_date="", end_date=""):
+        pulls.append((start_date, end_date))
+        return pd.DataFrame(
+            {"ottoneu_player_id": [1], "minutes": [30.0], "points": [20.0]}
+        )
+
+    monkeypatch.setattr(ytd_totals, "get_league_leaderboard", fake_leaderboard)
+
+    assert ytd_totals.get_season(date(2026, 4, 10)) == "2025-26"
+    assert ytd_totals.get_season(date(2026, 8, 1)) == "2026-27"
+
+    ytd_totals.get_incremental_leaderboard(today=date(2026, 4, 10))
+    # the offseason before the opener doesn't pull a backwards date range
+    ytd_totals.get_incremental_leaderboard(today=date(2026, 8, 15))
+    totals = ytd_totals.get_incremental_leaderboard(today=date(2026, 10, 5))
+
+    assert pulls == [
+        ("2025-10-21", "2026-04-09"),
+        ("", ""),
+        ("2026-10-01", "2026-10-04"),
+    ]
+    # last season's totals aren't carried into the new one
+    assert totals.minutes.tolist() == [30.0]
+    assert artifacts.list_artifact_versions("ytd_totals_2025-26") == ["20260409T000000"]